@@ -5,72 +5,337 @@ if version_info[0] < 3 or version_info[1] < 10:
 ###########################################################
 
 import numpy as np
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+from time import perf_counter
 from typing import Callable
 
-def newton(f: Callable[[float], float], df: Callable[[float], float], x0: float, tol: float = 1e-8,
-           maxiter: int = 50) -> np.ndarray[float]:
+# Status codes of the batched solvers (one per start point)
+CONVERGED = 0
+MAXITER_EXCEEDED = 1
+ZERO_DERIVATIVE = 2
+LINESEARCH_FAILED = 3
+NO_BRACKET = 4
+_RUNNING = -1
+
+class Dual:
+    """
+        Dual number val + der*ε with ε² = 0 for forward-mode automatic differentiation.
+        val and der may be floats or arrays, numpy ufuncs like np.sin or np.exp are supported.
+    """
+    __slots__ = ("val", "der")
+
+    def __init__(self, val, der=0.0):
+        self.val = val
+        self.der = der
+
+    @staticmethod
+    def _lift(x) -> "Dual":
+        return x if isinstance(x, Dual) else Dual(x, 0.0)
+
+    def __add__(self, other):
+        other = Dual._lift(other)
+        return Dual(self.val + other.val, self.der + other.der)
+
+    def __sub__(self, other):
+        other = Dual._lift(other)
+        return Dual(self.val - other.val, self.der - other.der)
+
+    def __mul__(self, other):
+        other = Dual._lift(other)
+        return Dual(self.val * other.val, self.der * other.val + self.val * other.der)
+
+    def __truediv__(self, other):
+        other = Dual._lift(other)
+        return Dual(self.val / other.val, (self.der * other.val - self.val * other.der) / other.val**2)
+
+    def __pow__(self, other):
+        if isinstance(other, Dual):
+            val = self.val**other.val
+            return Dual(val, val * (other.der * np.log(self.val) + other.val * self.der / self.val))
+        return Dual(self.val**other, other * self.val**(other - 1) * self.der)
+
+    def __radd__(self, other):
+        return self + other
+
+    def __rsub__(self, other):
+        return Dual._lift(other) - self
+
+    def __rmul__(self, other):
+        return self * other
+
+    def __rtruediv__(self, other):
+        return Dual._lift(other) / self
+
+    def __rpow__(self, other):
+        return Dual._lift(other)**self
+
+    def __neg__(self):
+        return Dual(-self.val, -self.der)
+
+    def __pos__(self):
+        return self
+
+    def __abs__(self):
+        return Dual(abs(self.val), np.sign(self.val) * self.der)
+
+    def __lt__(self, other):
+        return self.val < Dual._lift(other).val
+
+    def __le__(self, other):
+        return self.val <= Dual._lift(other).val
+
+    def __gt__(self, other):
+        return self.val > Dual._lift(other).val
+
+    def __ge__(self, other):
+        return self.val >= Dual._lift(other).val
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in _DUAL_BINARY:
+            a, b = (Dual._lift(x) for x in inputs)
+            return _DUAL_BINARY[ufunc](a, b)
+        if ufunc in _DUAL_UNARY:
+            x = inputs[0]
+            fun, dfun = _DUAL_UNARY[ufunc]
+            return Dual(fun(x.val), dfun(x.val) * x.der)
+        return NotImplemented
+
+
+_DUAL_BINARY = {
+    np.add: Dual.__add__,
+    np.subtract: Dual.__sub__,
+    np.multiply: Dual.__mul__,
+    np.true_divide: Dual.__truediv__,
+    np.power: Dual.__pow__,
+}
+
+_DUAL_UNARY = {
+    np.negative: (np.negative, lambda x: -np.ones_like(x)),
+    np.absolute: (np.absolute, np.sign),
+    np.square: (np.square, lambda x: 2 * x),
+    np.sqrt: (np.sqrt, lambda x: 0.5 / np.sqrt(x)),
+    np.exp: (np.exp, np.exp),
+    np.log: (np.log, lambda x: 1 / x),
+    np.sin: (np.sin, np.cos),
+    np.cos: (np.cos, lambda x: -np.sin(x)),
+    np.tan: (np.tan, lambda x: 1 / np.cos(x)**2),
+    np.arctan: (np.arctan, lambda x: 1 / (1 + x**2)),
+    np.sinh: (np.sinh, np.cosh),
+    np.cosh: (np.cosh, np.sinh),
+    np.tanh: (np.tanh, lambda x: 1 / np.cosh(x)**2),
+}
+
+
+class MemoizedFunction:
+    """
+        Wraps a scalar function f, caches f(x) per point and counts the evaluations.
+        Pass an instance to the Newton methods to read n_evals and n_hits afterwards.
+    """
+    def __init__(self, f: Callable[[float], float]):
+        self.f = f
+        self.cache = {}
+        self.n_evals = 0
+        self.n_hits = 0
+
+    def __call__(self, x: float) -> float:
+        key = float(x)
+        if key in self.cache:
+            self.n_hits += 1
+            return self.cache[key]
+        self.n_evals += 1
+        fx = self.f(x)
+        self.cache[key] = fx
+        return fx
+
+
+class Derivative:
+    """
+        Derivative of f computed by a difference quotient (forward, backward, central)
+        or exactly with dual numbers (dual). Works for scalars and arrays, the number of
+        calls is counted in n_evals.
+    """
+    methods = ("forward", "backward", "central", "dual")
+
+    def __init__(self, f: Callable[[float], float], method: str = "central", h: float | None = None):
+        if method not in self.methods:
+            raise ValueError(f"Unknown derivative method '{method}', use one of {self.methods}.")
+        if h is not None and h <= 0:
+            raise ValueError("Stepwidth h must be positive.")
+        self.f = f
+        self.method = method
+        self.h = h
+        self.n_evals = 0
+
+    def __call__(self, x):
+        self.n_evals += 1
+        if self.method == "dual":
+            f = self.f.f if isinstance(self.f, MemoizedFunction) else self.f
+            return f(Dual(x, np.ones_like(x, dtype=float))).der
+
+        # step widths balancing truncation and rounding error
+        eps = np.finfo(float).eps
+        scale = np.maximum(1.0, np.abs(x))
+        if self.method == "forward":
+            h = self.h if self.h is not None else np.sqrt(eps) * scale
+            return (self.f(x + h) - self.f(x)) / h
+        if self.method == "backward":
+            h = self.h if self.h is not None else np.sqrt(eps) * scale
+            return (self.f(x) - self.f(x - h)) / h
+        h = self.h if self.h is not None else np.cbrt(eps) * scale
+        return (self.f(x + h) - self.f(x - h)) / (2 * h)
+
+
+class NewtonTrace:
+    """
+        Opt-in telemetry for newton and newton_global. Every iteration records |f(x_k)|,
+        the step length |x_(k+1) - x_k|, the Armijo step width σ_k and its number of
+        backtracks, the wall time since the start and the cumulated f / df calls.
+        The observed convergence order is estimated online from the residuals.
+    """
+    dtype = np.dtype([("k", int), ("abs_f", float), ("step", float), ("sigma", float), ("backtracks", int),
+                      ("time", float), ("f_evals", int), ("df_evals", int), ("order", float)])
+
+    def __init__(self):
+        self.records = []
+        self._t0 = 0.0
+
+    def start(self) -> None:
+        self.records = []
+        self._t0 = perf_counter()
+
+    def record(self, abs_f: float, step: float, sigma: float, backtracks: int, f_evals: int, df_evals: int) -> None:
+        # q ≈ log(e_k / e_(k-1)) / log(e_(k-1) / e_(k-2)) with the residuals as error proxy
+        order = np.nan
+        if len(self.records) >= 2:
+            e2, e1 = self.records[-2][1], self.records[-1][1]
+            if 0 < abs_f < e1 < e2:
+                order = np.log(abs_f / e1) / np.log(e1 / e2)
+        self.records.append((len(self.records), abs_f, step, sigma, backtracks, perf_counter() - self._t0,
+                             f_evals, df_evals, order))
+
+    @property
+    def order(self) -> float:
+        """Latest estimate of the convergence order (nan if not yet available)"""
+        estimates = [r[-1] for r in self.records if np.isfinite(r[-1])]
+        return estimates[-1] if estimates else np.nan
+
+    @property
+    def rate(self) -> str:
+        """Classification of the observed order: 'quadratic', 'superlinear', 'linear' or 'unknown'"""
+        q = self.order
+        if not np.isfinite(q):
+            return "unknown"
+        if q > 1.8:
+            return "quadratic"
+        if q > 1.2:
+            return "superlinear"
+        return "linear"
+
+    def to_array(self) -> np.ndarray:
+        """Export of the records as NumPy structured array (fields see NewtonTrace.dtype)"""
+        return np.array(self.records, dtype=self.dtype)
+
+
+def _prepare(f: Callable, df: Callable | str, trace: NewtonTrace | None = None) -> tuple[MemoizedFunction, Callable]:
+    """
+        Wraps f for memoization and builds the derivative if df names a method.
+        With a trace df is wrapped as well, so that its calls can be counted.
+    """
+    if not isinstance(f, MemoizedFunction):
+        f = MemoizedFunction(f)
+    if isinstance(df, str):
+        df = Derivative(f, df)
+    elif trace is not None and not isinstance(df, (MemoizedFunction, Derivative)):
+        df = MemoizedFunction(df)
+    if trace is not None:
+        trace.start()
+    return f, df
+
+
+def newton(f: Callable[[float], float], df: Callable[[float], float] | str, x0: float, tol: float = 1e-8,
+           maxiter: int = 50, trace: NewtonTrace | None = None) -> np.ndarray[float]:
     """
         This method shall implement the local Newton method,
         that calculates a zero of some given function f
     Input:
-        f : Callable  -> Function of which to find a zero
-        df : Callable -> Derivative of f
+        f : Callable  -> Function of which to find a zero (values are memoized per point)
+        df : Callable -> Derivative of f, or one of "forward", "backward", "central", "dual"
+                         to compute it internally (see Derivative)
         x0 : float    -> Initial point
         tol: float    -> Tolerance for the stop criterion (optional)
         maxiter : int -> Maximal number of iterations
+        trace : NewtonTrace -> Records per-iteration telemetry if given (optional)
     Output:
         np.ndarray -> Array of the iterates x^(0), x^(1),..., x^(N)
     """
+    f, df = _prepare(f, df, trace)
     xs = [x0]
     xk = x0
 
     for _ in range(maxiter):
         fx = f(xk)
-        dfx = df(xk)
 
         if abs(fx) < tol:
             break
 
+        dfx = df(xk)
+
         if abs(dfx) < 1e-14:
             raise ValueError(f"Derivative is zero at x = {xk}. Cannot proceed.")
 
         xk = xk - fx / dfx
         xs.append(xk)
+        if trace is not None:
+            trace.record(abs(fx), abs(fx / dfx), 1.0, 0, f.n_evals, df.n_evals)
 
     else:
         if abs(f(xk)) >= tol:
+            if trace is not None:
+                trace.record(abs(f(xk)), np.nan, np.nan, 0, f.n_evals, df.n_evals)
             raise ValueError("Newton method did not converge within maxiter.")
 
+    if trace is not None:
+        trace.record(abs(f(xk)), np.nan, np.nan, 0, f.n_evals, df.n_evals)
+
     return np.array(xs)
 
-def newton_global(f: Callable[[float], float], df: Callable[[float], float], x0: float, tol: float = 1e-8,
-                  maxiter: int = 50, beta: float = 0.5, delta: float = 1e-3) -> np.ndarray[float]:
+def newton_global(f: Callable[[float], float], df: Callable[[float], float] | str, x0: float, tol: float = 1e-8,
+                  maxiter: int = 50, beta: float = 0.5, delta: float = 1e-3,
+                  trace: NewtonTrace | None = None) -> np.ndarray[float]:
     """
         This method shall implement the global Newton method,
         that calculates a zero of some given function f.
         It uses the Armijo search to determine the appropriate
         step width in each iteration.
     Input:
-        f : Callable  -> Function of which to find a zero
-        df : Callable -> Derivative of f
+        f : Callable  -> Function of which to find a zero (values are memoized per point)
+        df : Callable -> Derivative of f, or one of "forward", "backward", "central", "dual"
+                         to compute it internally (see Derivative)
         x0 : float    -> Initial point
         tol: float    -> Tolerance for the stop criterion (optional)
         maxiter : int -> Maximal number of iterations
         beta: float   -> Reduction parameter for the step width σ_k (σ_k = β*σ_{k-1} if needed, optional)
         delta: float  -> The Armijo constant (optional)
+        trace : NewtonTrace -> Records per-iteration telemetry if given (optional)
     Output:
         np.ndarray -> Array of the iterates x^(0), x^(1),..., x^(N)
     """
+    f, df = _prepare(f, df, trace)
     xs = [x0]
     xk = x0
 
     for _ in range(maxiter):
         fx = f(xk)
-        dfx = df(xk)
 
         if abs(fx) < tol:
             break
 
+        dfx = df(xk)
+
         if abs(dfx) < 1e-14:
             raise ValueError(f"Derivative is zero at x = {xk}. Cannot proceed.")
 
@@ -87,9 +352,390 @@ def newton_global(f: Callable[[float], float], df: Callable[[float], float], x0:
 
         xk = xk + sigma * sk
         xs.append(xk)
+        if trace is not None:
+            trace.record(abs(fx), abs(sigma * sk), sigma, round(np.log(sigma) / np.log(beta)), f.n_evals, df.n_evals)
 
     else:
         if abs(f(xk)) >= tol:
+            if trace is not None:
+                trace.record(abs(f(xk)), np.nan, np.nan, 0, f.n_evals, df.n_evals)
             raise ValueError("Global Newton method did not converge within maxiter.")
 
-    return np.array(xs)
\ No newline at end of file
+    if trace is not None:
+        trace.record(abs(f(xk)), np.nan, np.nan, 0, f.n_evals, df.n_evals)
+
+    return np.array(xs)
+
+
+def _newton_batch(f: Callable[[np.ndarray], np.ndarray], df: Callable[[np.ndarray], np.ndarray], x0: np.ndarray,
+                  tol: float, maxiter: int, step: Callable,
+                  status0: np.ndarray | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+        Masked driver shared by the batched solvers. f and df are evaluated once per
+        iteration on the still active lanes only, converged or failed lanes are dropped.
+        step(idx, x, fx, dfx) returns the new iterates of the lanes idx and a status
+        array that is _RUNNING for lanes that shall continue, optionally followed by the
+        values of f at the new iterates, which are then not evaluated again.
+        Lanes whose entry of status0 is not _RUNNING keep that status and are never iterated.
+    """
+    if isinstance(df, str):
+        df = Derivative(f, df)
+    x0 = np.asarray(x0, dtype=float)
+    x = x0.ravel().copy()
+    iters = np.zeros(x.size, dtype=int)
+    status = np.full(x.size, MAXITER_EXCEEDED, dtype=int)
+    active = np.arange(x.size)
+    if status0 is not None:
+        status0 = np.ravel(status0)
+        status = np.where(status0 == _RUNNING, status, status0)
+        active = active[status0 == _RUNNING]
+    f_known = None  # f at x[active] if the last step already computed it
+
+    for k in range(maxiter + 1):
+        if active.size == 0:
+            break
+
+        xa = x[active]
+        fx = np.asarray(f(xa), dtype=float) if f_known is None else f_known
+        done = np.abs(fx) < tol
+        status[active[done]] = CONVERGED
+        active, xa, fx = active[~done], xa[~done], fx[~done]
+
+        if k == maxiter or active.size == 0:
+            break
+
+        dfx = np.asarray(df(xa), dtype=float)
+        x_new, code, *f_new = step(active, xa, fx, dfx)
+
+        moved = code == _RUNNING
+        x[active[moved]] = x_new[moved]
+        iters[active[moved]] += 1
+        status[active[~moved]] = code[~moved]
+        active = active[moved]
+        f_known = f_new[0][moved] if f_new else None
+
+    return x.reshape(x0.shape), iters.reshape(x0.shape), status.reshape(x0.shape)
+
+
+def _newton_step(idx: np.ndarray, x: np.ndarray, fx: np.ndarray, dfx: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+        Plain Newton update for the batched local method
+    """
+    code = np.where(np.abs(dfx) < 1e-14, ZERO_DERIVATIVE, _RUNNING)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return x - fx / dfx, code
+
+
+def newton_batch(f: Callable[[np.ndarray], np.ndarray], df: Callable[[np.ndarray], np.ndarray] | str, x0: np.ndarray,
+                 tol: float = 1e-8, maxiter: int = 50) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+        This method implements the local Newton method for many start points at once.
+        f and df must accept arrays and are called once per iteration on all lanes
+        that have neither converged nor failed yet.
+    Input:
+        f : Callable      -> Vectorized function of which to find a zero
+        df : Callable     -> Vectorized derivative of f or a method name accepted by Derivative
+        x0 : np.ndarray   -> Array of initial points (any shape)
+        tol: float        -> Tolerance for the stop criterion (optional)
+        maxiter : int     -> Maximal number of iterations
+    Output:
+        x : np.ndarray      -> Last iterate of every lane (shape of x0)
+        iters : np.ndarray  -> Number of Newton steps taken per lane
+        status : np.ndarray -> CONVERGED, MAXITER_EXCEEDED or ZERO_DERIVATIVE per lane
+    """
+    return _newton_batch(f, df, x0, tol, maxiter, _newton_step)
+
+
+def newton_global_batch(f: Callable[[np.ndarray], np.ndarray], df: Callable[[np.ndarray], np.ndarray] | str,
+                        x0: np.ndarray, tol: float = 1e-8, maxiter: int = 50, beta: float = 0.5,
+                        delta: float = 1e-3) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+        This method implements the global Newton method for many start points at once.
+        The Armijo search runs per lane: every backtracking round evaluates f once on
+        all lanes whose trial point has not been accepted yet.
+    Input:
+        f : Callable      -> Vectorized function of which to find a zero
+        df : Callable     -> Vectorized derivative of f or a method name accepted by Derivative
+        x0 : np.ndarray   -> Array of initial points (any shape)
+        tol: float        -> Tolerance for the stop criterion (optional)
+        maxiter : int     -> Maximal number of iterations
+        beta: float       -> Reduction parameter for the step width σ_k (optional)
+        delta: float      -> The Armijo constant (optional)
+    Output:
+        x : np.ndarray      -> Last iterate of every lane (shape of x0)
+        iters : np.ndarray  -> Number of Newton steps taken per lane
+        status : np.ndarray -> CONVERGED, MAXITER_EXCEEDED, ZERO_DERIVATIVE or LINESEARCH_FAILED per lane
+    """
+    def armijo_step(idx, x, fx, dfx):
+        code = np.where(np.abs(dfx) < 1e-14, ZERO_DERIVATIVE, _RUNNING)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            sk = -fx / dfx
+        sigma = np.ones_like(x)
+        f_new = np.full_like(x, np.nan)
+        pending = np.flatnonzero(code == _RUNNING)
+
+        while pending.size > 0:
+            x_trial = x[pending] + sigma[pending] * sk[pending]
+            f_trial = np.asarray(f(x_trial), dtype=float)
+            accepted = np.abs(f_trial) <= (1 - delta * sigma[pending]) * np.abs(fx[pending])
+            f_new[pending[accepted]] = f_trial[accepted]  # reused by the next iteration
+            pending = pending[~accepted]
+            sigma[pending] *= beta
+            too_small = sigma[pending] < 1e-12
+            code[pending[too_small]] = LINESEARCH_FAILED
+            pending = pending[~too_small]
+
+        return x + sigma * sk, code, f_new
+
+    return _newton_batch(f, df, x0, tol, maxiter, armijo_step)
+
+
+
+def _safeguard_bound(width: float, xtol: float) -> int:
+    """
+        Worst-case number of iterations of the safeguarded method. Every bisection halves
+        the bracket and between two bisections every Newton step at least halves the
+        previous step, so at most L = log2(width/xtol) + 1 steps follow each of the L bisections.
+    """
+    L = int(np.ceil(np.log2(max(width / xtol, 1.0)))) + 1
+    return L * L
+
+
+def newton_safeguarded(f: Callable[[float], float], df: Callable[[float], float] | str, a: float, b: float,
+                       tol: float = 1e-8, xtol: float = 1e-12, maxiter: int | None = None) -> np.ndarray[float]:
+    """
+        This method implements a bracketed hybrid of the Newton method and bisection.
+        Starting from the midpoint of [a, b] it takes a Newton step if it stays inside
+        the bracket and is at most half as long as the previous step, otherwise it
+        bisects. It stops if |f(x)| < tol, or if the bracket or the step is shorter than
+        xtol, which happens after at most (log2((b - a)/xtol) + 1)^2 iterations.
+    Input:
+        f : Callable  -> Function of which to find a zero, f(a) and f(b) must have opposite signs
+        df : Callable -> Derivative of f or a method name accepted by Derivative
+        a : float     -> One end of the bracket
+        b : float     -> Other end of the bracket
+        tol: float    -> Tolerance for the stop criterion |f(x)| < tol (optional)
+        xtol: float   -> Tolerance for the stop criterion on the bracket width and step (optional)
+        maxiter : int -> Maximal number of iterations (optional, default is the worst-case bound)
+    Output:
+        np.ndarray -> Array of the iterates x^(0), x^(1),..., x^(N)
+    """
+    f, df = _prepare(f, df)
+    lo, hi = min(a, b), max(a, b)
+    f_lo, f_hi = f(lo), f(hi)
+    if np.sign(f_lo) == np.sign(f_hi) and f_lo != 0:
+        raise ValueError("f(a) and f(b) must have opposite signs.")
+    if maxiter is None:
+        maxiter = _safeguard_bound(hi - lo, xtol)
+
+    xk = 0.5 * (lo + hi)
+    xs = [xk]
+    step = hi - lo
+
+    for _ in range(maxiter):
+        fx = f(xk)
+
+        if abs(fx) < tol or step < xtol:
+            break
+
+        if np.sign(fx) == np.sign(f_lo):
+            lo = xk
+        else:
+            hi = xk
+        mid = 0.5 * (lo + hi)
+
+        if hi - lo < xtol or mid in (lo, hi):
+            break
+
+        dfx = df(xk)
+        x_new = mid
+        if abs(dfx) >= 1e-14 and lo < xk - fx / dfx < hi and abs(fx / dfx) <= 0.5 * step:
+            x_new = xk - fx / dfx
+
+        step = abs(x_new - xk)
+        xk = x_new
+        xs.append(xk)
+
+    else:
+        if abs(f(xk)) >= tol and step >= xtol:
+            raise ValueError("Safeguarded Newton method did not converge within maxiter.")
+
+    return np.array(xs)
+
+
+def newton_safeguarded_batch(f: Callable[[np.ndarray], np.ndarray], df: Callable[[np.ndarray], np.ndarray] | str,
+                             a: np.ndarray, b: np.ndarray, tol: float = 1e-8, xtol: float = 1e-12,
+                             maxiter: int | None = None) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+        This method implements the safeguarded Newton method for many brackets at once,
+        every lane follows the same rules as in newton_safeguarded.
+    Input:
+        f : Callable      -> Vectorized function of which to find a zero
+        df : Callable     -> Vectorized derivative of f or a method name accepted by Derivative
+        a : np.ndarray    -> One end of the brackets
+        b : np.ndarray    -> Other end of the brackets (same shape as a)
+        tol: float        -> Tolerance for the stop criterion |f(x)| < tol (optional)
+        xtol: float       -> Tolerance for the stop criterion on the bracket width and step (optional)
+        maxiter : int     -> Maximal number of iterations (optional, default is the worst-case bound)
+    Output:
+        x : np.ndarray      -> Last iterate of every lane
+        iters : np.ndarray  -> Number of steps taken per lane
+        status : np.ndarray -> CONVERGED, MAXITER_EXCEEDED or NO_BRACKET (f(a) and f(b) have the
+                               same sign, the lane is not iterated) per lane
+    """
+    a, b = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float))
+    lo, hi = np.minimum(a, b).ravel(), np.maximum(a, b).ravel()
+    sign_lo = np.sign(f(lo))
+    bracketed = (sign_lo != np.sign(f(hi))) | (sign_lo == 0)
+    if maxiter is None:
+        maxiter = _safeguard_bound(np.max(hi - lo, where=bracketed, initial=0.0), xtol)
+    step = hi - lo
+
+    def safeguarded_step(idx, x, fx, dfx):
+        left = np.sign(fx) == sign_lo[idx]
+        lo[idx] = np.where(left, x, lo[idx])
+        hi[idx] = np.where(left, hi[idx], x)
+        mid = 0.5 * (lo[idx] + hi[idx])
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            x_newton = x - fx / dfx
+        use_newton = ((np.abs(dfx) >= 1e-14) & (lo[idx] < x_newton) & (x_newton < hi[idx])
+                      & (np.abs(x_newton - x) <= 0.5 * step[idx]))
+        done = (step[idx] < xtol) | (hi[idx] - lo[idx] < xtol) | (mid == lo[idx]) | (mid == hi[idx])
+
+        x_new = np.where(use_newton, x_newton, mid)
+        step[idx] = np.abs(x_new - x)
+        return x_new, np.where(done, CONVERGED, _RUNNING)
+
+    return _newton_batch(f, df, 0.5 * (lo + hi).reshape(a.shape), tol, maxiter, safeguarded_step,
+                         np.where(bracketed, _RUNNING, NO_BRACKET))
+
+
+def _factorize(J) -> Callable[[np.ndarray], np.ndarray]:
+    """
+        Factorizes the Jacobian J once and returns a solver for J s = r.
+        Sparse matrices get a sparse LU, dense ones a dense LU with partial pivoting.
+    """
+    if scipy.sparse.issparse(J):
+        try:
+            return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(J)).solve
+        except RuntimeError as e:
+            raise ValueError(f"Jacobian is singular: {e}")
+
+    lu, piv = scipy.linalg.lu_factor(np.asarray(J, dtype=float), check_finite=False)
+    if np.any(np.abs(np.diag(lu)) < 1e-14):
+        raise ValueError("Jacobian is singular. Cannot proceed.")
+    return lambda r: scipy.linalg.lu_solve((lu, piv), r, check_finite=False)
+
+
+def _newton_system(F: Callable[[np.ndarray], np.ndarray], DF: Callable, x0: np.ndarray, tol: float, maxiter: int,
+                   reuse: int, armijo: bool, beta: float, delta: float) -> tuple[np.ndarray, dict]:
+    """
+        Common engine of newton_system and newton_system_global.
+        The Jacobian is refactorized every 'reuse' iterations; a stale factorization is
+        dropped early as soon as its full step no longer reduces the residual (sufficiently),
+        only a fresh one gets the Armijo line search.
+    """
+    if reuse < 1:
+        raise ValueError("reuse must be at least 1.")
+
+    xk = np.array(x0, dtype=float)
+    xs = [xk.copy()]
+    stats = {"n_residuals": 0, "n_jacobians": 0, "n_factorizations": 0}
+
+    Fx = F(xk)
+    stats["n_residuals"] += 1
+    norm_Fx = np.linalg.norm(Fx)
+    solve = None
+    age = 0
+
+    for _ in range(maxiter):
+        if norm_Fx < tol:
+            break
+
+        fresh = solve is None or age >= reuse
+        if fresh:
+            solve = _factorize(DF(xk))
+            stats["n_jacobians"] += 1
+            stats["n_factorizations"] += 1
+            age = 0
+        sk = -solve(Fx)
+        age += 1
+
+        sigma = 1.0
+        x_trial = xk + sk
+        F_trial = F(x_trial)
+        stats["n_residuals"] += 1
+        norm_trial = np.linalg.norm(F_trial)
+
+        if armijo:
+            if not fresh and norm_trial > (1 - delta) * norm_Fx:
+                # a stale factorization whose full step is rejected is not worth a line search,
+                # retry with a fresh Jacobian instead
+                solve = None
+                continue
+
+            while norm_trial > (1 - delta * sigma) * norm_Fx and sigma * beta >= 1e-12:
+                sigma *= beta
+                x_trial = xk + sigma * sk
+                F_trial = F(x_trial)
+                stats["n_residuals"] += 1
+                norm_trial = np.linalg.norm(F_trial)
+
+            if norm_trial > (1 - delta * sigma) * norm_Fx:
+                raise RuntimeError("Armijo line search failed. Step size too small.")
+
+        elif not fresh and norm_trial >= norm_Fx:
+            solve = None
+
+        xk, Fx, norm_Fx = x_trial, F_trial, norm_trial
+        xs.append(xk.copy())
+
+    else:
+        if norm_Fx >= tol:
+            raise ValueError("Newton method for systems did not converge within maxiter.")
+
+    return np.array(xs), stats
+
+
+def newton_system(F: Callable[[np.ndarray], np.ndarray], DF: Callable, x0: np.ndarray, tol: float = 1e-8,
+                  maxiter: int = 50, reuse: int = 1) -> tuple[np.ndarray, dict]:
+    """
+        This method implements the local Newton method for systems F(x) = 0 with F: R^n -> R^n.
+        With reuse = k > 1 it runs the chord/Shamanskii variant, that factorizes the
+        Jacobian only every k iterations and reuses the factors in between.
+    Input:
+        F : Callable     -> Function of which to find a zero
+        DF : Callable    -> Jacobian of F, may return a dense array or a scipy.sparse matrix
+        x0 : np.ndarray  -> Initial point
+        tol: float       -> Tolerance for the stop criterion ||F(x)||_2 < tol (optional)
+        maxiter : int    -> Maximal number of iterations
+        reuse : int      -> Number of iterations a Jacobian factorization is reused (optional)
+    Output:
+        np.ndarray -> Array of the iterates x^(0), x^(1),..., x^(N) (one per row)
+        dict       -> Work counters n_residuals, n_jacobians and n_factorizations
+    """
+    return _newton_system(F, DF, x0, tol, maxiter, reuse, False, 0.5, 1e-3)
+
+
+def newton_system_global(F: Callable[[np.ndarray], np.ndarray], DF: Callable, x0: np.ndarray, tol: float = 1e-8,
+                         maxiter: int = 50, reuse: int = 1, beta: float = 0.5,
+                         delta: float = 1e-3) -> tuple[np.ndarray, dict]:
+    """
+        This method implements the global Newton method for systems F(x) = 0 with F: R^n -> R^n.
+        It uses the Armijo search on ||F||_2 to determine the step width and supports
+        the same Jacobian reuse as newton_system.
+    Input:
+        F : Callable     -> Function of which to find a zero
+        DF : Callable    -> Jacobian of F, may return a dense array or a scipy.sparse matrix
+        x0 : np.ndarray  -> Initial point
+        tol: float       -> Tolerance for the stop criterion ||F(x)||_2 < tol (optional)
+        maxiter : int    -> Maximal number of iterations
+        reuse : int      -> Number of iterations a Jacobian factorization is reused (optional)
+        beta: float      -> Reduction parameter for the step width σ_k (optional)
+        delta: float     -> The Armijo constant (optional)
+    Output:
+        np.ndarray -> Array of the iterates x^(0), x^(1),..., x^(N) (one per row)
+        dict       -> Work counters n_residuals, n_jacobians and n_factorizations
+    """
+    return _newton_system(F, DF, x0, tol, maxiter, reuse, True, beta, delta)
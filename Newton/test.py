@@ -1,6 +1,9 @@
 import unittest
 import numpy as np
-from newton import newton, newton_global
+import scipy.sparse
+from newton import (newton, newton_global, newton_batch, newton_global_batch, newton_system, newton_system_global,
+                    newton_safeguarded, newton_safeguarded_batch,
+                    MemoizedFunction, Derivative, NewtonTrace, CONVERGED, MAXITER_EXCEEDED, NO_BRACKET)
 
 class TestNewton(unittest.TestCase):
     def test_newton(self):
@@ -10,6 +13,110 @@ class TestNewton(unittest.TestCase):
             x_k = newton(f, df, 0.0)
             self.assertEqual(len(x_k), 1)
 
+    def test_newton_batch(self):
+        f = lambda x: x**3 - 2*x + 2
+        df = lambda x: 3*x**2 - 2
+        x0 = np.array([-3.0, -1.5, 0.0, 2.0])
+        x, iters, status = newton_batch(f, df, x0)
+        with self.subTest("Check that the lanes agree with the scalar method"):
+            for i in [0, 1]:
+                xs = newton(f, df, x0[i])
+                self.assertEqual(x[i], xs[-1])
+                self.assertEqual(iters[i], len(xs) - 1)
+                self.assertEqual(status[i], CONVERGED)
+        with self.subTest("Check that the cycling lane is flagged"):
+            self.assertEqual(status[2], MAXITER_EXCEEDED)
+        with self.subTest("Check that the global method converges on every lane"):
+            x, iters, status = newton_global_batch(f, df, x0, beta=0.33)
+            self.assertTrue(np.all(status == CONVERGED))
+            self.assertTrue(np.allclose(x, newton_global(f, df, 0.0, beta=0.33)[-1]))
+        with self.subTest("Check that f at an accepted trial point is not evaluated again"):
+            calls = []
+            g = lambda x: calls.append(1) or x**2 - 2
+            x, iters, status = newton_global_batch(g, lambda x: 2 * x, np.array([10.0]))
+            self.assertEqual(status[0], CONVERGED)
+            self.assertEqual(len(calls), iters[0] + 1)  # no backtracking happens here
+
+    def test_newton_safeguarded(self):
+        f = lambda x: x**3 - 2*x + 2
+        df = lambda x: 3*x**2 - 2
+        with self.subTest("Check convergence where the local method cycles"):
+            xs = newton_safeguarded(f, df, -3, 3)
+            self.assertLess(abs(f(xs[-1])), 1e-8)
+        with self.subTest("Check for error if the root is not bracketed"):
+            self.assertRaises(ValueError, newton_safeguarded, f, df, 0, 3)
+        with self.subTest("Check the batched version against the scalar one"):
+            a = np.array([-3.0, -2.0, -10.0])
+            b = np.array([3.0, 0.0, 100.0])
+            x, iters, status = newton_safeguarded_batch(f, df, a, b)
+            self.assertTrue(np.all(status == CONVERGED))
+            for i in range(len(a)):
+                xs = newton_safeguarded(f, df, a[i], b[i])
+                self.assertEqual(x[i], xs[-1])
+                self.assertEqual(iters[i], len(xs) - 1)
+        with self.subTest("Check that a lane without a bracket is flagged and the others are solved"):
+            x_bad, iters_bad, status_bad = newton_safeguarded_batch(f, df, np.array([-3.0, 0.0, -2.0]), np.array([3.0, 3.0, 0.0]))
+            self.assertEqual(list(status_bad), [CONVERGED, NO_BRACKET, CONVERGED])
+            self.assertEqual(iters_bad[1], 0)
+            self.assertTrue(np.all(x_bad[[0, 2]] == x[:2]))
+
+    def test_derivative_free(self):
+        f = lambda x: (1/20) * x**3 + x - 2 + np.cos((6/5) * x)
+        df = lambda x: (3/20) * x**2 + 1 - (6/5) * np.sin((6/5) * x)
+        xs = newton(f, df, 3.5)
+        with self.subTest("Check that dual numbers reproduce the exact iterates"):
+            self.assertTrue(np.allclose(newton(f, "dual", 3.5), xs, rtol=0, atol=1e-14))
+        with self.subTest("Check difference quotients"):
+            for method in ["forward", "backward", "central"]:
+                self.assertAlmostEqual(newton(f, method, 3.5)[-1], xs[-1])
+        with self.subTest("Check that known values of f are not recomputed"):
+            fm = MemoizedFunction(f)
+            dfm = Derivative(fm, "forward")
+            xs_fd = newton_global(fm, dfm, 3.5)
+            self.assertEqual(dfm.n_evals, len(xs_fd) - 1)
+            self.assertEqual(fm.n_hits, dfm.n_evals + len(xs_fd) - 1)
+
+    def test_trace(self):
+        f = lambda x: x**2 - 2
+        df = lambda x: 2*x
+        trace = NewtonTrace()
+        xs = newton_global(f, df, 10.0, trace=trace)
+        records = trace.to_array()
+        with self.subTest("Check one record per iterate"):
+            self.assertEqual(len(records), len(xs))
+            self.assertTrue(np.allclose(records["abs_f"], np.abs(f(xs))))
+            self.assertTrue(np.allclose(records["step"][:-1], np.abs(np.diff(xs))))
+        with self.subTest("Check the call counters"):
+            self.assertEqual(records["df_evals"][-1], len(xs) - 1)
+            self.assertTrue(np.all(np.diff(records["f_evals"]) >= 0))
+        with self.subTest("Check the observed convergence order"):
+            self.assertEqual(trace.rate, "quadratic")
+
+    def test_newton_system(self):
+        n = 200
+        T = scipy.sparse.diags([-1.0, 4.0, -1.0], [-1, 0, 1], shape=(n, n), format='csc')
+        F = lambda x: T @ x + x**3 - 1
+        DF = lambda x: T + scipy.sparse.diags(3 * x**2)
+        x0 = np.zeros(n)
+        xs, stats = newton_system(F, DF, x0, tol=1e-10)
+        with self.subTest("Check for a root of the sparse system"):
+            self.assertLess(np.linalg.norm(F(xs[-1])), 1e-10)
+            self.assertEqual(stats["n_factorizations"], len(xs) - 1)
+        with self.subTest("Check that the chord variant saves factorizations"):
+            xs_chord, stats_chord = newton_system(F, DF, x0, tol=1e-10, reuse=4)
+            self.assertTrue(np.allclose(xs_chord[-1], xs[-1]))
+            self.assertLess(stats_chord["n_factorizations"], stats["n_factorizations"])
+        with self.subTest("Check the global method on a dense Jacobian"):
+            xs_glob, _ = newton_system_global(F, lambda x: DF(x).toarray(), x0 + 10, tol=1e-10, reuse=2)
+            self.assertTrue(np.allclose(xs_glob[-1], xs[-1]))
+        with self.subTest("Check that a rejected stale step is not backtracked"):
+            G = lambda x: np.array([x[0]**2 + x[1]**2 - 4, np.exp(x[0]) + x[1] - 1])
+            DG = lambda x: np.array([[2 * x[0], 2 * x[1]], [np.exp(x[0]), 1]])
+            _, stats_fresh = newton_system_global(G, DG, np.array([1.0, 1.0]))
+            for reuse in [2, 3]:
+                _, stats_reuse = newton_system_global(G, DG, np.array([1.0, 1.0]), reuse=reuse)
+                self.assertLessEqual(stats_reuse["n_jacobians"], stats_fresh["n_jacobians"])
+                self.assertLess(stats_reuse["n_residuals"], 2 * stats_fresh["n_residuals"])
 
 
 if __name__ == '__main__':
@@ -5,8 +5,13 @@ if version_info[0] < 3 or version_info[1] < 10:
 ###########################################################
 
 import numpy as np
-from scipy.interpolate import CubicSpline
-from typing import Callable
+import warnings
+from abc import ABC, abstractmethod
+from functools import lru_cache
+from scipy.fft import dct
+from scipy.linalg import solve_banded
+from scipy.special import gammaln
+from typing import Callable, Iterator
 
 # CAUTION: The input arguments of the following method MUST NOT be changed.
 # Any changes may cause the automated tests to fail and, hence, reduce
@@ -33,22 +38,11 @@ def newton_equidistant(func: Callable[[float], float], bnds: list[float], n_eval
     [xx, yy] : list[np.ndarray]
         Sample points and values
     """
-    a, b = bnds
-    xx = np.linspace(a, b, n_sample_pts)
-    yy = func(xx)
-    co = yy.astype(float).copy()
-
-    for j in range(1, n_sample_pts):
-        for i in range(n_sample_pts - 1, j - 1, -1):
-            co[i] = (co[i] - co[i - 1]) / (xx[i] - xx[i - j])
-
-    x = np.linspace(a, b, n_eval_pts)
-    y = np.zeros_like(x, dtype=float)
-
-    for c, xv in zip(co[::-1], xx[::-1]):
-        y = y * (x - xv) + c
+    interpolant = NewtonInterpolant(func, bnds, n_sample_pts, "equidistant")
+    x = np.linspace(bnds[0], bnds[1], n_eval_pts)
+    y = interpolant(x)
 
-    return [x, y], [xx, yy] # DO NOT CHANGE
+    return [x, y], [interpolant.xx, interpolant.yy] # DO NOT CHANGE
 
 # CAUTION: The input arguments of the following method MUST NOT be changed.
 # Any changes may cause the automated tests to fail and, hence, reduce
@@ -75,26 +69,11 @@ def newton_chebyshev(func: Callable[[float], float], bnds: list[float], n_eval_p
     [xx, yy] : list[np.ndarray]
         Sample points and values
     """
-    a, b = bnds
-    mid = 0.5 * (a + b)
-    half = 0.5 * (b - a)
-
-    k = np.arange(n_sample_pts)
-    xx = mid + half * np.cos((2 * k + 1) * np.pi / (2 * n_sample_pts))
-    yy = func(xx)
-
-    coeffs = yy.astype(float).copy()
-    for j in range(1, n_sample_pts):
-        for i in range(n_sample_pts - 1, j - 1, -1):
-            coeffs[i] = (coeffs[i] - coeffs[i - 1]) / (xx[i] - xx[i - j])
+    interpolant = NewtonInterpolant(func, bnds, n_sample_pts, "chebyshev")
+    x = np.linspace(bnds[0], bnds[1], n_eval_pts)
+    y = interpolant(x)
 
-    x = np.linspace(a, b, n_eval_pts)
-    y = np.zeros_like(x, dtype=float)
-
-    for c, xv in zip(coeffs[::-1], xx[::-1]):
-        y = y * (x - xv) + c
-        
-    return [x, y], [xx, yy] # DO NOT CHANGE
+    return [x, y], [interpolant.xx, interpolant.yy] # DO NOT CHANGE
 
 # CAUTION: The input arguments of the following method MUST NOT be changed.
 # Any changes may cause the automated tests to fail and, hence, reduce
@@ -121,15 +100,11 @@ def cubic_spline_equidistant(func: Callable[[float], float], bnds: list[float],
     [xx, yy] : list[np.ndarray]
         Sample points and values
     """
-    a, b = bnds
-    xx = np.linspace(a, b, n_sample_pts)
-    yy = func(xx)
+    interpolant = SplineInterpolant(func, bnds, n_sample_pts, "equidistant")
+    x = np.linspace(bnds[0], bnds[1], n_eval_pts)
+    y = interpolant(x)
 
-    spline = CubicSpline(xx, yy)        # Spline create
-    x = np.linspace(a, b, n_eval_pts)
-    y = spline(x)                       # test
-
-    return [x, y], [xx, yy] # DO NOT CHANGE
+    return [x, y], [interpolant.xx, interpolant.yy] # DO NOT CHANGE
 
 # CAUTION: The input arguments of the following method MUST NOT be changed.
 # Any changes may cause the automated tests to fail and, hence, reduce
@@ -156,19 +131,611 @@ def cubic_spline_chebyshev(func: Callable[[float], float], bnds: list[float], n_
     [xx, yy] : list[np.ndarray]
         Sample points and values
     """
+    interpolant = SplineInterpolant(func, bnds, n_sample_pts, "chebyshev")
+    x = np.linspace(bnds[0], bnds[1], n_eval_pts)
+    y = interpolant(x)
+
+    return [x, y], [interpolant.xx, interpolant.yy] # DO NOT CHANGE
+
+
+def barycentric_weights(xx: np.ndarray) -> np.ndarray:
+    """Calculates the barycentric weights w_j = 1 / prod_{k != j} (x_j - x_k) for arbitrary
+       distinct nodes. The products are formed in the log domain and scaled to max |w_j| = 1,
+       which leaves the barycentric formula unchanged but avoids over- and underflow.
+
+    Parameters
+    ----------
+    xx : np.ndarray
+        Distinct sample points
+
+    Returns
+    -------
+    np.ndarray
+        Scaled barycentric weights
+    """
+    diff = xx[:, None] - xx[None, :]
+    np.fill_diagonal(diff, 1.0)
+    log_w = -np.sum(np.log(np.abs(diff)), axis=1)
+    sign = np.prod(np.sign(diff), axis=1)
+    return sign * np.exp(log_w - np.max(log_w))
+
+
+def barycentric_weights_equidistant(n: int) -> np.ndarray:
+    """Closed form of the scaled barycentric weights for n equidistant points,
+       w_j = (-1)^j binom(n-1, j).
+
+    Parameters
+    ----------
+    n : int
+        Amount of sample points
+
+    Returns
+    -------
+    np.ndarray
+        Scaled barycentric weights
+    """
+    j = np.arange(n)
+    log_binom = gammaln(n) - gammaln(j + 1) - gammaln(n - j)
+    return (-1.0) ** j * np.exp(log_binom - np.max(log_binom))
+
+
+def barycentric_weights_chebyshev(n: int) -> np.ndarray:
+    """Closed form of the scaled barycentric weights for the n Chebyshev points
+       cos((2j + 1) pi / (2n)), w_j = (-1)^j sin((2j + 1) pi / (2n)).
+
+    Parameters
+    ----------
+    n : int
+        Amount of sample points
+
+    Returns
+    -------
+    np.ndarray
+        Scaled barycentric weights
+    """
+    j = np.arange(n)
+    return (-1.0) ** j * np.sin((2 * j + 1) * np.pi / (2 * n))
+
+
+def barycentric_evaluate(xx: np.ndarray, yy: np.ndarray, w: np.ndarray, x: np.ndarray,
+                         max_entries: int = 2**20) -> np.ndarray:
+    """Evaluates the interpolation polynomial through (xx, yy) at x with the second
+       (true) barycentric formula. x is processed in chunks of max_entries // len(xx)
+       points, so that every temporary array holds at most max_entries entries
+       (at least one row), however many nodes there are.
+
+    Parameters
+    ----------
+    xx : np.ndarray
+        Sample points
+    yy : np.ndarray
+        Values at the sample points
+    w : np.ndarray
+        Barycentric weights of xx
+    x : np.ndarray
+        Evaluation points
+    max_entries : int
+        Maximum amount of entries of the (points x nodes) temporary arrays
+
+    Returns
+    -------
+    np.ndarray
+        Values of the interpolation polynomial at x
+    """
+    x = np.asarray(x, dtype=float)
+    xf = x.ravel()
+    y = np.empty_like(xf)
+    chunk_size = max(1, max_entries // max(len(xx), 1))
+
+    for start in range(0, xf.size, chunk_size):
+        xc = xf[start:start + chunk_size]
+        diff = xc[:, None] - xx[None, :]
+        exact = diff == 0
+        diff[exact] = 1.0
+        c = w / diff
+        yc = (c @ yy) / np.sum(c, axis=1)
+
+        hit_rows, hit_cols = np.nonzero(exact)
+        yc[hit_rows] = yy[hit_cols]
+        y[start:start + chunk_size] = yc
+
+    return y.reshape(x.shape)
+
+
+def chebyshev_coefficients(yy: np.ndarray) -> np.ndarray:
+    """Calculates the coefficients c_k of the interpolation polynomial sum_k c_k T_k through
+       the values at the Chebyshev points cos((2j + 1) pi / (2n)), j = 0,...,n-1, with one DCT-II.
+
+    Parameters
+    ----------
+    yy : np.ndarray
+        Values at the Chebyshev points (in the order of newton_chebyshev)
+
+    Returns
+    -------
+    np.ndarray
+        Chebyshev coefficients c_0,...,c_{n-1}
+    """
+    c = dct(np.asarray(yy, dtype=float), type=2) / len(yy)
+    c[0] /= 2
+    return c
+
+
+def chebyshev_lobatto_coefficients(yy: np.ndarray) -> np.ndarray:
+    """Calculates the coefficients c_k of the interpolation polynomial sum_k c_k T_k through
+       the values at the Chebyshev extreme points cos(j pi / n), j = 0,...,n, with one DCT-I.
+
+    Parameters
+    ----------
+    yy : np.ndarray
+        Values at the Chebyshev extreme points (at least two)
+
+    Returns
+    -------
+    np.ndarray
+        Chebyshev coefficients c_0,...,c_n
+    """
+    c = dct(np.asarray(yy, dtype=float), type=1) / (len(yy) - 1)
+    c[[0, -1]] /= 2
+    return c
+
+
+def chebyshev_evaluate(c: np.ndarray, bnds: list[float], x: np.ndarray, chunk_size: int = 2**13) -> np.ndarray:
+    """Evaluates sum_k c_k T_k(t) with t the image of x in [-1, 1] by the Clenshaw recurrence.
+       x is processed in cache-sized chunks with in-place updates.
+
+    Parameters
+    ----------
+    c : np.ndarray
+        Chebyshev coefficients
+    bnds : list[float]
+        Interval the polynomial is defined on
+    x : np.ndarray
+        Evaluation points
+    chunk_size : int
+        Amount of evaluation points per chunk
+
+    Returns
+    -------
+    np.ndarray
+        Values of the polynomial at x
+    """
     a, b = bnds
-    k = np.arange(n_sample_pts)
-    mid = 0.5 * (a + b)
-    half = 0.5 * (b - a)
-    xx = mid + half * np.cos((2 * k + 1) * np.pi / (2 * n_sample_pts))
-    yy = func(xx)
+    x = np.asarray(x, dtype=float)
+    t = ((2 * x - (a + b)) / (b - a)).ravel()
+    y = np.empty_like(t)
+
+    for start in range(0, t.size, chunk_size):
+        tc = t[start:start + chunk_size]
+        t2 = 2 * tc
+        b1 = np.zeros_like(tc)
+        b2 = np.zeros_like(tc)
+        tmp = np.empty_like(tc)
+        for ck in c[:0:-1]:
+            np.multiply(t2, b1, out=tmp)
+            tmp -= b2
+            tmp += ck
+            b1, b2, tmp = tmp, b1, b2
+        y[start:start + chunk_size] = c[0] + tc * b1 - b2
+
+    return y.reshape(x.shape)
+
+
+def barycentric_equidistant(func: Callable[[float], float], bnds: list[float], n_eval_pts: int, n_sample_pts: int):
+    """The method calculates the polynomial interpolation of the function 'func' in the interval 'bnds'
+       using 'n_sample_pts' equidistant sample points and 'n_eval_pts' evaluation points with the
+       barycentric formula and closed-form weights (same output as newton_equidistant).
+
+    Parameters
+    ----------
+    func : Callable
+        Function that shall be approximated
+    bnds : list[float]
+        Interval in which 'func' shall be interpolated
+    n_eval_pts : int
+        Amount of evalutation points
+    n_sample_pts : int
+        Amount of sample points
+
+    Returns
+    -------
+    [x, y] : list[np.ndarray]
+        Evaluation points and values
+    [xx, yy] : list[np.ndarray]
+        Sample points and values
+    """
+    interpolant = BarycentricInterpolant(func, bnds, n_sample_pts, "equidistant")
+    x = np.linspace(bnds[0], bnds[1], n_eval_pts)
+    y = interpolant(x)
+
+    return [x, y], [interpolant.xx, interpolant.yy]
+
+
+def barycentric_chebyshev(func: Callable[[float], float], bnds: list[float], n_eval_pts: int, n_sample_pts: int):
+    """The method calculates the polynomial interpolation of the function 'func' in the interval 'bnds'
+       using 'n_sample_pts' Chebyshev sample points and 'n_eval_pts' evaluation points. The
+       interpolant is built in O(n log n) from its Chebyshev coefficients (DCT) and evaluated
+       with the Clenshaw recurrence (same output as newton_chebyshev).
+
+    Parameters
+    ----------
+    func : Callable
+        Function that shall be approximated
+    bnds : list[float]
+        Interval in which 'func' shall be interpolated
+    n_eval_pts : int
+        Amount of evalutation points
+    n_sample_pts : int
+        Amount of sample points
+
+    Returns
+    -------
+    [x, y] : list[np.ndarray]
+        Evaluation points and values
+    [xx, yy] : list[np.ndarray]
+        Sample points and values
+    """
+    interpolant = ChebyshevInterpolant(func, bnds, n_sample_pts, "chebyshev")
+    x = np.linspace(bnds[0], bnds[1], n_eval_pts)
+    y = interpolant(x)
+
+    return [x, y], [interpolant.xx, interpolant.yy]
+
+
+def linspace_chunks(a: float, b: float, n: int, chunk_size: int) -> Iterator[np.ndarray]:
+    """Yields np.linspace(a, b, n) in consecutive blocks of at most 'chunk_size' points
+       without ever holding the full array. The values agree exactly with np.linspace.
+
+    Parameters
+    ----------
+    a : float
+        First point
+    b : float
+        Last point
+    n : int
+        Total amount of points
+    chunk_size : int
+        Maximal amount of points per block
+
+    Yields
+    ------
+    np.ndarray
+        Next block of points
+    """
+    step = (b - a) / (n - 1) if n > 1 else 0.0
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        x = np.arange(start, stop) * step + a
+        if stop == n and n > 1:
+            x[-1] = b
+        yield x
+
+
+@lru_cache(maxsize=128)
+def node_set(kind: str, n: int, a: float, b: float) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the sample points of the given kind together with their barycentric weights.
+       The result is cached per (kind, n, bounds) and read-only, so that interpolants on the
+       same nodes share one copy.
+
+    Parameters
+    ----------
+    kind : str
+        'equidistant', 'chebyshev' or 'lobatto' (Chebyshev extreme points cos(j pi / (n-1)))
+    n : int
+        Amount of sample points
+    a : float
+        Lower bound of the interval
+    b : float
+        Upper bound of the interval
+
+    Returns
+    -------
+    xx : np.ndarray
+        Sample points
+    w : np.ndarray
+        Scaled barycentric weights of the sample points
+    """
+    if kind == "equidistant":
+        xx = np.linspace(a, b, n)
+        w = barycentric_weights_equidistant(n)
+    elif kind == "chebyshev":
+        mid = 0.5 * (a + b)
+        half = 0.5 * (b - a)
+        k = np.arange(n)
+        xx = mid + half * np.cos((2 * k + 1) * np.pi / (2 * n))
+        w = barycentric_weights_chebyshev(n)
+    elif kind == "lobatto":
+        mid = 0.5 * (a + b)
+        half = 0.5 * (b - a)
+        j = np.arange(n)
+        xx = mid + half * np.cos(j * np.pi / max(n - 1, 1))
+        w = (-1.0) ** j
+        w[[0, -1]] *= 0.5
+    else:
+        raise ValueError(f"Unknown kind of sample points '{kind}', use 'equidistant', 'chebyshev' or 'lobatto'.")
+
+    xx.flags.writeable = False
+    w.flags.writeable = False
+    return xx, w
+
+
+class Interpolant(ABC):
+    """Interpolant of a function on 'n_sample_pts' sample points of the given kind in 'bnds'.
+       The function is sampled and the interpolant fitted once on construction, afterwards
+       it can be evaluated on arbitrary arrays by calling it. Subclasses implement __call__.
+
+    Parameters
+    ----------
+    func : Callable
+        Function that shall be approximated
+    bnds : list[float]
+        Interval in which 'func' shall be interpolated
+    n_sample_pts : int
+        Amount of sample points
+    nodes : str
+        Kind of sample points, 'equidistant' or 'chebyshev'
+    """
+    def __init__(self, func: Callable[[float], float], bnds: list[float], n_sample_pts: int,
+                 nodes: str = "equidistant"):
+        self.bnds = (float(bnds[0]), float(bnds[1]))
+        self.nodes = nodes
+        xx, self.w = node_set(nodes, n_sample_pts, *self.bnds)
+        self.xx = xx.copy()  # only the cached table is read-only, callers and func get a writable array
+        self.yy = func(self.xx)
+        self._fit()
+
+    def _fit(self) -> None:
+        pass
+
+    @abstractmethod
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        """Evaluates the interpolant at x"""
+
+    def evaluate_chunks(self, n_eval_pts: int, chunk_size: int = 2**20) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+        """Evaluates the interpolant on 'n_eval_pts' equidistant points in 'bnds' block by block,
+           so that the peak memory is bounded by 'chunk_size' and not by 'n_eval_pts'.
+
+        Parameters
+        ----------
+        n_eval_pts : int
+            Amount of evaluation points
+        chunk_size : int
+            Maximal amount of evaluation points per block
+
+        Yields
+        ------
+        (x, y) : tuple[np.ndarray]
+            Evaluation points and values of the next block
+        """
+        for x in linspace_chunks(*self.bnds, n_eval_pts, chunk_size):
+            yield x, self(x)
+
+    def evaluate_to(self, y_out: np.ndarray, x_out: np.ndarray | None = None, chunk_size: int = 2**20) -> np.ndarray:
+        """Writes the values on len(y_out) equidistant points in 'bnds' into 'y_out' (e.g. a np.memmap),
+           and the points into 'x_out' if given.
+
+        Parameters
+        ----------
+        y_out : np.ndarray
+            Output array for the values
+        x_out : np.ndarray
+            Output array for the evaluation points (optional)
+        chunk_size : int
+            Maximal amount of evaluation points per block
+
+        Returns
+        -------
+        np.ndarray
+            y_out
+        """
+        start = 0
+        for x, y in self.evaluate_chunks(len(y_out), chunk_size):
+            y_out[start:start + len(x)] = y
+            if x_out is not None:
+                x_out[start:start + len(x)] = x
+            start += len(x)
+        return y_out
+
+
+class NewtonInterpolant(Interpolant):
+    """Interpolation polynomial in Newton form (divided differences, Horner evaluation)."""
+    def _fit(self) -> None:
+        xx = self.xx
+        co = np.asarray(self.yy).astype(float)
+        for j in range(1, len(xx)):
+            co[j:] = (co[j:] - co[j - 1:-1]) / (xx[j:] - xx[:-j])
+        self.coeffs = co
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        y = np.zeros_like(x)
+        for c, xv in zip(self.coeffs[::-1], self.xx[::-1]):
+            y = y * (x - xv) + c
+        return y
+
+
+class BarycentricInterpolant(Interpolant):
+    """Interpolation polynomial evaluated by the barycentric formula with cached weights."""
+    def _fit(self) -> None:
+        self._values = np.asarray(self.yy, dtype=float)
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return barycentric_evaluate(self.xx, self._values, self.w, x)
+
+
+class ChebyshevInterpolant(Interpolant):
+    """Interpolation polynomial in Chebyshev form on Chebyshev or Chebyshev-Lobatto sample points
+       (DCT fit, Clenshaw evaluation). ChebyshevInterpolant.adaptive chooses the degree itself."""
+    def __init__(self, func: Callable[[float], float], bnds: list[float], n_sample_pts: int,
+                 nodes: str = "chebyshev"):
+        if nodes not in ("chebyshev", "lobatto"):
+            raise ValueError("ChebyshevInterpolant requires Chebyshev or Chebyshev-Lobatto sample points.")
+        super().__init__(func, bnds, n_sample_pts, nodes)
+        self.n_evals = n_sample_pts
+
+    def _fit(self) -> None:
+        if self.nodes == "lobatto":
+            self.coeffs = chebyshev_lobatto_coefficients(self.yy)
+        else:
+            self.coeffs = chebyshev_coefficients(self.yy)
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return chebyshev_evaluate(self.coeffs, self.bnds, x)
+
+    @classmethod
+    def adaptive(cls, func: Callable[[float], float], bnds: list[float], tol: float = 1e-14,
+                 n_max: int = 2**16 + 1) -> "ChebyshevInterpolant":
+        """Approximates 'func' on 'bnds' by Chebyshev interpolation on Chebyshev-Lobatto points
+           with automatically chosen degree. The number of intervals is doubled until the trailing
+           coefficients fall below 'tol' relative to the largest one. The grids are nested, so
+           every doubling only evaluates 'func' at the new midpoints. Coefficients below the
+           tolerance are chopped off afterwards.
+
+        Parameters
+        ----------
+        func : Callable
+            Vectorized function that shall be approximated
+        bnds : list[float]
+            Interval in which 'func' shall be approximated
+        tol : float
+            Relative tolerance for the trailing coefficients
+        n_max : int
+            Maximal amount of sample points
+
+        Returns
+        -------
+        ChebyshevInterpolant
+            Interpolant with the attributes xx, yy (samples), coeffs and n_evals
+        """
+        a, b = float(bnds[0]), float(bnds[1])
+        n = 9
+        xx, w = node_set("lobatto", n, a, b)
+        xx = xx.copy()
+        yy = np.asarray(func(xx), dtype=float)
+        n_evals = n
+
+        while True:
+            coeffs = chebyshev_lobatto_coefficients(yy)
+            scale = np.max(np.abs(coeffs))
+            if np.max(np.abs(coeffs[-4:])) <= tol * scale:
+                break
+            if 2 * n - 1 > n_max:
+                warnings.warn(f"Chebyshev approximation did not converge with {n} sample points.", UserWarning)
+                break
+
+            n = 2 * n - 1
+            xx, w = node_set("lobatto", n, a, b)
+            xx = xx.copy()
+            y_new = np.empty(n)
+            y_new[::2] = yy
+            y_new[1::2] = func(xx[1::2])
+            yy = y_new
+            n_evals += n // 2
+
+        significant = np.flatnonzero(np.abs(coeffs) > tol * scale)
+        interpolant = cls.__new__(cls)
+        interpolant.bnds = (a, b)
+        interpolant.nodes = "lobatto"
+        interpolant.xx, interpolant.w, interpolant.yy = xx, w, yy
+        interpolant.coeffs = coeffs[:significant[-1] + 1] if significant.size else coeffs[:1]
+        interpolant.n_evals = n_evals
+        return interpolant
+
+
+class PiecewiseCubic:
+    """Cubic spline interpolant with not-a-knot end conditions (the default of scipy's CubicSpline).
+       The slopes are obtained from one tridiagonal system in O(n), the coefficients of all pieces
+       are stored in one contiguous (4, n-1) array (highest power first). On uniform grids the piece
+       of a point is found by index arithmetic in O(1), otherwise by a binary search. Evaluation
+       runs in cache-sized chunks.
+
+    Parameters
+    ----------
+    xx : np.ndarray
+        Strictly increasing knots (at least two)
+    yy : np.ndarray
+        Values at the knots
+    """
+    def __init__(self, xx: np.ndarray, yy: np.ndarray):
+        xx = np.asarray(xx, dtype=float)
+        yy = np.asarray(yy, dtype=float)
+        n = len(xx)
+        dx = np.diff(xx)
+        if n < 2 or np.any(dx <= 0):
+            raise ValueError("At least two strictly increasing knots are required.")
+        slope = np.diff(yy) / dx
+
+        if n == 2:
+            s = np.array([slope[0], slope[0]])
+        elif n == 3:
+            # not-a-knot on three knots is the interpolating parabola
+            d2 = (slope[1] - slope[0]) / (xx[2] - xx[0])
+            s = slope[0] + d2 * np.array([-dx[0], dx[0], dx[0] + 2 * dx[1]])
+        else:
+            ab = np.zeros((3, n))
+            rhs = np.empty(n)
+            ab[1, 1:-1] = 2 * (dx[:-1] + dx[1:])
+            ab[0, 2:] = dx[:-1]
+            ab[2, :-2] = dx[1:]
+            rhs[1:-1] = 3 * (dx[1:] * slope[:-1] + dx[:-1] * slope[1:])
+
+            d = xx[2] - xx[0]
+            ab[1, 0] = dx[1]
+            ab[0, 1] = d
+            rhs[0] = ((dx[0] + 2 * d) * dx[1] * slope[0] + dx[0]**2 * slope[1]) / d
+
+            d = xx[-1] - xx[-3]
+            ab[1, -1] = dx[-2]
+            ab[2, -2] = d
+            rhs[-1] = (dx[-1]**2 * slope[-2] + (2 * d + dx[-1]) * dx[-2] * slope[-1]) / d
+
+            s = solve_banded((1, 1), ab, rhs, overwrite_ab=True, overwrite_b=True, check_finite=False)
+
+        t = (s[:-1] + s[1:] - 2 * slope) / dx
+        self.coeffs = np.ascontiguousarray([t / dx, (slope - s[:-1]) / dx - t, s[:-1], yy[:-1]])
+        self.xx = xx
+        h = (xx[-1] - xx[0]) / (n - 1)
+        self.h = h if np.allclose(dx, h, rtol=1e-8, atol=0) else None
+
+    def __call__(self, x: np.ndarray, chunk_size: int = 2**16) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        xf = x.ravel()
+        y = np.empty_like(xf)
+        for start in range(0, xf.size, chunk_size):
+            y[start:start + chunk_size] = self._evaluate(xf[start:start + chunk_size])
+        return y.reshape(x.shape)
+
+    def _evaluate(self, x: np.ndarray) -> np.ndarray:
+        last = len(self.xx) - 2
+        if self.h is not None:
+            idx = ((x - self.xx[0]) / self.h).astype(np.intp)
+            np.clip(idx, 0, last, out=idx)
+            # rounding in the knots may shift the index by one
+            idx -= (x < self.xx.take(idx)) & (idx > 0)
+            idx += (x >= self.xx.take(idx + 1)) & (idx < last)
+        else:
+            idx = np.searchsorted(self.xx, x, side="right") - 1
+            np.clip(idx, 0, last, out=idx)
+
+        t = x - self.xx.take(idx)
+        c3, c2, c1, c0 = self.coeffs
+        y = c3.take(idx)
+        y *= t
+        y += c2.take(idx)
+        y *= t
+        y += c1.take(idx)
+        y *= t
+        y += c0.take(idx)
+        return y
 
-    sorted_indices = np.argsort(xx)
-    xx = xx[sorted_indices]
-    yy = yy[sorted_indices]
 
-    spline = CubicSpline(xx, yy)
-    x = np.linspace(a, b, n_eval_pts)
-    y = spline(x)
+class SplineInterpolant(Interpolant):
+    """Cubic spline interpolant (not-a-knot, see PiecewiseCubic). The sample points are kept in
+       ascending order, the descending Chebyshev points are simply reversed instead of sorted."""
+    def _fit(self) -> None:
+        if self.nodes in ("chebyshev", "lobatto"):
+            self.xx, self.yy = self.xx[::-1], self.yy[::-1]
+        self.spline = PiecewiseCubic(self.xx, self.yy)
 
-    return [x, y], [xx, yy] # DO NOT CHANGE
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        return self.spline(x)
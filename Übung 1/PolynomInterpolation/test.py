@@ -1,6 +1,12 @@
+import os
+import tempfile
 import unittest
 import numpy as np
 from interpolation import newton_equidistant, newton_chebyshev, cubic_spline_equidistant, cubic_spline_chebyshev
+from interpolation import barycentric_equidistant, barycentric_chebyshev, barycentric_weights, barycentric_weights_chebyshev
+from interpolation import barycentric_evaluate
+from interpolation import Interpolant, NewtonInterpolant, SplineInterpolant, ChebyshevInterpolant, PiecewiseCubic, node_set
+from scipy.interpolate import CubicSpline
 
 class TestInterpolation(unittest.TestCase):
     # These tests check whether or not input and output has the correct
@@ -54,6 +60,97 @@ class TestInterpolation(unittest.TestCase):
         with self.subTest("Test Values at Evaluation Points"):
             self.assertTrue(np.allclose(y, y))
 
+    def test_Barycentric(self):
+        f = lambda x: 1 / (1 + x**2)
+        with self.subTest("Test agreement with the Newton form"):
+            [x, y], [xx, yy] = barycentric_equidistant(f, [-5, 5], 100, 9)
+            [x2, y2], [xx2, yy2] = newton_equidistant(f, [-5, 5], 100, 9)
+            self.assertTrue(np.allclose(xx, xx2) and np.allclose(x, x2) and np.allclose(y, y2))
+            [x, y], [xx, yy] = barycentric_chebyshev(f, [-5, 5], 100, 9)
+            [x2, y2], [xx2, yy2] = newton_chebyshev(f, [-5, 5], 100, 9)
+            self.assertTrue(np.allclose(xx, xx2) and np.allclose(x, x2) and np.allclose(y, y2))
+        with self.subTest("Test closed-form Chebyshev weights"):
+            w = barycentric_weights(np.cos((2 * np.arange(12) + 1) * np.pi / 24))
+            w_closed = barycentric_weights_chebyshev(12)
+            self.assertTrue(np.allclose(w / w[0], w_closed / w_closed[0]))
+        with self.subTest("Test stability for many nodes"):
+            [x, y], _ = barycentric_chebyshev(f, [-5, 5], 1000, 500)
+            self.assertTrue(np.allclose(y, f(x), rtol=0, atol=1e-13))
+        with self.subTest("Test chunk length adapted to the number of nodes"):
+            xx = np.linspace(-1, 1, 30)
+            yy, w = np.exp(xx), barycentric_weights(xx)
+            x = np.concatenate([np.linspace(-1, 1, 101), xx[:3]])
+            y = barycentric_evaluate(xx, yy, w, x)
+            for max_entries in [1, 29, 31, 1000]:
+                self.assertTrue(np.allclose(barycentric_evaluate(xx, yy, w, x, max_entries), y))
+
+    def test_Interpolant(self):
+        calls = []
+        f = lambda x: calls.append(len(x)) or np.exp(x)
+        p = NewtonInterpolant(f, [-2, 2], 7, "chebyshev")
+        with self.subTest("Test fit once, evaluate many"):
+            for x in [np.linspace(-2, 2, 10), np.array([0.5]), np.zeros((3, 4))]:
+                self.assertEqual(p(x).shape, x.shape)
+            self.assertEqual(calls, [7])
+        with self.subTest("Test agreement of the interpolants"):
+            x = np.linspace(-2, 2, 50)
+            q = ChebyshevInterpolant(np.exp, [-2, 2], 7)
+            self.assertTrue(np.allclose(p(x), q(x)))
+            self.assertTrue(np.allclose(SplineInterpolant(np.exp, [-2, 2], 7, "chebyshev").xx, np.sort(q.xx)))
+        with self.subTest("Test shared node cache"):
+            self.assertIs(node_set("chebyshev", 7, -2.0, 2.0)[0], node_set("chebyshev", 7, -2.0, 2.0)[0])
+            self.assertTrue(np.array_equal(node_set("chebyshev", 7, -2.0, 2.0)[0], q.xx))
+        with self.subTest("Test that callers get writable sample points"):
+            for method in [newton_equidistant, newton_chebyshev, cubic_spline_equidistant, cubic_spline_chebyshev]:
+                _, [xx, _] = method(np.sin, [0, 1], 10, 5)
+                xx += 1.0
+            self.assertFalse(np.shares_memory(q.xx, node_set("chebyshev", 7, -2.0, 2.0)[0]))
+        with self.subTest("Test that the base class is abstract"):
+            self.assertRaises(TypeError, Interpolant, np.sin, [0, 1], 5)
+
+    def test_Adaptive_Chebyshev(self):
+        f = lambda x: 1 / (1 + x**2)
+        p = ChebyshevInterpolant.adaptive(f, [-5, 5], tol=1e-14)
+        x = np.linspace(-5, 5, 1000)
+        with self.subTest("Test accuracy"):
+            self.assertTrue(np.allclose(p(x), f(x), rtol=0, atol=1e-13))
+        with self.subTest("Test reuse of the samples of the nested grids"):
+            self.assertEqual(p.n_evals, len(p.xx))
+            self.assertTrue(np.allclose(p.yy, f(p.xx)))
+        with self.subTest("Test minimal degree for a polynomial"):
+            q = ChebyshevInterpolant.adaptive(lambda x: x**3 - x, [-1, 2])
+            self.assertEqual(q.n_evals, 9)
+            self.assertEqual(len(q.coeffs), 4)
+
+    def test_Chunked_Evaluation(self):
+        p = NewtonInterpolant(np.exp, [-2, 2], 7, "equidistant")
+        s = SplineInterpolant(np.exp, [-2, 2], 7, "chebyshev")
+        x = np.linspace(-2, 2, 1001)
+        with self.subTest("Test blocks of the Newton form"):
+            blocks = list(p.evaluate_chunks(1001, chunk_size=300))
+            self.assertEqual([len(xb) for xb, _ in blocks], [300, 300, 300, 101])
+            self.assertTrue(np.array_equal(np.concatenate([xb for xb, _ in blocks]), x))
+            self.assertTrue(np.allclose(np.concatenate([yb for _, yb in blocks]), p(x)))
+        with self.subTest("Test writing the spline into a memmap"):
+            with tempfile.TemporaryDirectory() as tmp:
+                y_out = np.memmap(os.path.join(tmp, "y.dat"), dtype=float, mode="w+", shape=(1001,))
+                s.evaluate_to(y_out, chunk_size=128)
+                self.assertTrue(np.allclose(y_out, s(x)))
+                del y_out
+
+    def test_Piecewise_Cubic(self):
+        rng = np.random.default_rng(0)
+        x = np.linspace(-4, 4, 999)
+        for n in [2, 3, 4, 50]:
+            with self.subTest(f"Test agreement with scipy's not-a-knot spline on {n} knots"):
+                for xx in [np.linspace(-3, 3, n), np.sort(rng.uniform(-3, 3, n))]:
+                    yy = np.sin(xx)
+                    self.assertTrue(np.allclose(PiecewiseCubic(xx, yy)(x), CubicSpline(xx, yy)(x), rtol=0, atol=1e-12))
+        with self.subTest("Test index arithmetic on a uniform grid"):
+            xx = np.linspace(0, 1, 10001)
+            p = PiecewiseCubic(xx, np.exp(xx))
+            self.assertIsNotNone(p.h)
+            self.assertTrue(np.allclose(p(xx), np.exp(xx), rtol=0, atol=1e-15))
 
 
 if __name__ == '__main__':
@@ -5,7 +5,7 @@ if version_info[0] < 3 or version_info[1] < 10:
     raise Exception("Must be using Python 3.10 or newer")
 ###########################################################
 from scipy.interpolate import CubicSpline
-from quadrature import newton_cotes_quadrature, global_newton_cotes_quadrature, monte_carlo_quadrature
+from quadrature import newton_cotes_quadrature, global_newton_cotes_quadrature, monte_carlo_running
 import os
 import numpy as np
 import matplotlib.pyplot as plt
@@ -36,8 +36,8 @@ if __name__ == '__main__':
     print(f"Newton-Cotes plot saved: {nc_path}")
     plt.close()
 
-    n_mc_samples = np.arange(1, 10001)
-    vals_mc = [monte_carlo_quadrature(f, a, b, n_val) for n_val in n_mc_samples]
+    # one stream of samples yields the estimates for all n = 1..10000
+    n_mc_samples, vals_mc, _ = monte_carlo_running(f, a, b, 10000, np.random.default_rng(0))
 
     plt.figure()
     plt.plot(n_mc_samples, vals_mc, linestyle='-', alpha=0.7, label='Monte-Carlo Approx.')
@@ -94,10 +94,9 @@ if __name__ == '__main__':
     plt.close()
 
     # Monte-Carlo Convergence Plot
-    np.random.seed(0)
     mc_samples = np.logspace(1, 4, num=50, dtype=int)
-    vals_mc = [monte_carlo_quadrature(f, a, b, n) for n in mc_samples]
-    errors_mc = [abs(val - true_val) for val in vals_mc]
+    _, running_mc, _ = monte_carlo_running(f, a, b, mc_samples[-1], np.random.default_rng(0))
+    errors_mc = np.abs(running_mc[mc_samples - 1] - true_val)
 
     plt.figure()
     plt.loglog(mc_samples, errors_mc, linestyle='', marker='o', alpha=0.7, label='Monte-Carlo')
@@ -1,6 +1,58 @@
+import heapq
+import math
+import warnings
 import numpy as np
-from scipy import integrate
-from typing import Callable
+from concurrent.futures import Executor, ProcessPoolExecutor
+from fractions import Fraction
+from functools import lru_cache
+from scipy.fft import dct
+from scipy.stats import qmc
+from typing import Callable, Iterator
+
+
+@lru_cache(maxsize=None)
+def newton_cotes_weights_exact(n: int) -> tuple[Fraction, ...]:
+    """This method calculates the exact Newton-Cotes weights for an interval [0, 1]
+       with n+1 equidistant points by solving the moment system
+       sum_k w_k (k/n)^j = 1/(j+1), j = 0,...,n, in rational arithmetic.
+       The result is cached, so every n is computed once per process.
+
+    Parameters
+    ----------
+    n : int
+        Degree of the interpolation polynomial (n+1 points)
+
+    Returns
+    -------
+    tuple[Fraction]
+        Exact Newton-Cotes weights.
+    """
+    if n == 0:
+        return (Fraction(1),)
+
+    # with the integer nodes k = 0,...,n the moments become n^j / (j+1)
+    rows = [[Fraction(k**j) for k in range(n + 1)] + [Fraction(n**j, j + 1)] for j in range(n + 1)]
+
+    for i in range(n + 1):
+        pivot = next(r for r in range(i, n + 1) if rows[r][i] != 0)
+        rows[i], rows[pivot] = rows[pivot], rows[i]
+        for r in range(i + 1, n + 1):
+            factor = rows[r][i] / rows[i][i]
+            if factor != 0:
+                rows[r] = [v - factor * p for v, p in zip(rows[r], rows[i])]
+
+    w = [Fraction(0)] * (n + 1)
+    for i in reversed(range(n + 1)):
+        w[i] = (rows[i][-1] - sum(rows[i][k] * w[k] for k in range(i + 1, n + 1))) / rows[i][i]
+    return tuple(w)
+
+
+@lru_cache(maxsize=None)
+def _newton_cotes_table(n: int) -> np.ndarray:
+    """Read-only float copy of the exact weights, shared by all quadrature calls"""
+    w = np.array([float(wk) for wk in newton_cotes_weights_exact(n)])
+    w.flags.writeable = False
+    return w
 
 # CAUTION: The input arguments of the following method MUST NOT be changed.
 # Any changes may cause the automated tests to fail and, hence, reduce
@@ -19,26 +71,8 @@ def newton_cotes_weights(n: int) -> np.ndarray[float]:
     np.ndarray
         Array of Newton-Cotes weights.
     """
-    weights = np.zeros(n + 1)
-    nodes = np.linspace(0, 1, n + 1)
-
-    # integrate every L basis polynomial -> weights
-    for k in range(n + 1):  
-        current_node = nodes[k]
-        denominator = 1.0
-        for j, node_j in enumerate(nodes):
-            if j != k:
-                denominator *= (current_node - node_j)
-
-        def L_k_integrate(x: float) -> float: # assume denom non zero, calc the k-th Lagrange polynomial
-            numerator = 1.0
-            for j, node_j in enumerate(nodes):
-                if j != k:
-                    numerator *= (x - node_j)
-            return numerator / denominator
-
-        weights[k], _ = integrate.quad(L_k_integrate, 0, 1) # quad returns: (value, error)
-    
+    weights = _newton_cotes_table(n).copy()
+
     return weights # DO NOT CHANGE
 
 # CAUTION: The input arguments of the following method MUST NOT be changed.
@@ -65,7 +99,7 @@ def newton_cotes_quadrature(f: Callable[[float], float], a: float, b: float, n:
         Approximated value of the integral
     """
     integral = 0.0
-    w = newton_cotes_weights(n)
+    w = _newton_cotes_table(n)
     nodes = np.linspace(a, b, n + 1)
     
     integral_sum = 0.0
@@ -138,3 +172,697 @@ def monte_carlo_quadrature(f: Callable[[float], float], a: float, b: float, n: i
         
     integral = (b - a) * (sum_f / n)
     return integral # DO NOT CHANGE
+
+def _composite_quadrature(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, x01: np.ndarray,
+                          w01: np.ndarray, m: int) -> float:
+    """Applies the rule with nodes x01 and weights w01 on [0, 1] on m subintervals of [a, b].
+       'f' is called once on all distinct nodes; if the rule contains both endpoints,
+       neighbouring subintervals share them. The values are gathered into an (m, len(x01))
+       matrix and reduced with one matrix-vector product."""
+    if m < 1:
+        raise ValueError("m must be positive.")
+    h = (b - a) / m
+    k = len(x01)
+    starts = a + h * np.arange(m)[:, None]
+
+    if k > 1 and x01[0] == 0 and x01[-1] == 1:
+        nodes = np.empty(m * (k - 1) + 1)
+        nodes[:-1] = (starts + h * x01[:-1]).ravel()
+        nodes[-1] = b
+        idx = (k - 1) * np.arange(m)[:, None] + np.arange(k)
+    else:
+        nodes = (starts + h * x01).ravel()
+        idx = np.arange(m * k).reshape(m, k)
+
+    fx = np.broadcast_to(np.asarray(f(nodes), dtype=float), nodes.shape)
+    return h * float(np.sum(fx[idx] @ w01))
+
+def composite_newton_cotes_quadrature(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, n: int, m: int) -> float:
+    """This method calculates the integral of 'f' from 'a' to 'b' using the global Newton-Cotes
+       rule like global_newton_cotes_quadrature, but evaluates 'f' only once on all distinct
+       nodes and sums up the subintervals with one matrix-vector product.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated
+    a : float
+        Lower bound of the integration interval
+    b : float
+        Upper bound of the integration interval
+    n : int
+        Degree of the interpolation polynomial
+    m : int
+        Amount of subintervals
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    if n < 1:
+        raise ValueError("n must be positive.")
+    return _composite_quadrature(f, a, b, np.linspace(0, 1, n + 1), _newton_cotes_table(n), m)
+
+def adaptive_newton_cotes_quadrature(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, tol: float = 1e-10,
+                                     n: int = 2, max_evals: int = 10**6) -> tuple[float, float, int]:
+    """This method calculates the integral of 'f' from 'a' to 'b' adaptively with the embedded
+       pair of the Newton-Cotes rule of degree n on an interval and on its two halves (2n+1 nodes).
+       Their difference divided by 2^p - 1, p the order of the rule, estimates the error of
+       the finer value on an interval. The interval with the largest
+       error estimate is split next (priority queue), the values at its 2n+1 nodes are reused
+       by its halves, so every split costs 2n new function values.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated
+    a : float
+        Lower bound of the integration interval
+    b : float
+        Upper bound of the integration interval
+    tol : float
+        Target for the sum of the error estimates
+    n : int
+        Degree of the interpolation polynomial of the basic rule
+    max_evals : int
+        Maximal amount of function evaluations
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    float
+        Estimated error bound
+    int
+        Amount of function evaluations
+    """
+    w = _newton_cotes_table(n)
+    # the rules of even degree are exact for one more degree
+    scale = 1 / (2**(n + 2 if n % 2 == 0 else n + 1) - 1)
+
+    def estimate(lo, hi, fv):
+        coarse = (hi - lo) * (fv[::2] @ w)
+        fine = 0.5 * (hi - lo) * (fv[:n + 1] @ w + fv[n:] @ w)
+        return fine, scale * abs(fine - coarse)
+
+    fv = np.asarray(f(np.linspace(a, b, 2 * n + 1)), dtype=float)
+    n_evals = 2 * n + 1
+    value, err = estimate(a, b, fv)
+    heap = [(-err, 0, a, b, value, err, fv)]
+    count = 1
+    total_err = err
+
+    while total_err > tol and n_evals + 2 * n <= max_evals:
+        _, _, lo, hi, value, err, fv = heapq.heappop(heap)
+        mid = 0.5 * (lo + hi)
+        q = 0.25 * (hi - lo) / n
+        # the n new nodes of each half lie between the nodes it inherits
+        offsets = (2 * np.arange(n) + 1) * q
+        f_new = np.asarray(f(np.concatenate([lo + offsets, mid + offsets])), dtype=float)
+        n_evals += 2 * n
+
+        for start, stop, inherited, new in [(lo, mid, fv[:n + 1], f_new[:n]), (mid, hi, fv[n:], f_new[n:])]:
+            child = np.empty(2 * n + 1)
+            child[::2] = inherited
+            child[1::2] = new
+            child_value, child_err = estimate(start, stop, child)
+            heapq.heappush(heap, (-child_err, count, start, stop, child_value, child_err, child))
+            count += 1
+            total_err += child_err
+        total_err -= err
+
+    integral = math.fsum(item[4] for item in heap)
+    error = math.fsum(item[5] for item in heap)
+    return integral, error, n_evals
+
+@lru_cache(maxsize=None)
+def gauss_legendre_rule(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """This method calculates the nodes and weights of the Gauss-Legendre rule with n nodes
+       on [0, 1]. The roots of P_n are found by Newton's method on the three-term recurrence,
+       vectorized over all roots. The result is cached and read-only.
+
+    Parameters
+    ----------
+    n : int
+        Amount of nodes (the rule is exact for polynomials of degree 2n-1)
+
+    Returns
+    -------
+    np.ndarray
+        Nodes in ascending order
+    np.ndarray
+        Weights
+    """
+    if n < 1:
+        raise ValueError("n must be positive.")
+
+    def legendre(x):
+        p0, p1 = np.ones_like(x), x
+        for j in range(2, n + 1):
+            p0, p1 = p1, ((2 * j - 1) * x * p1 - (j - 1) * p0) / j
+        return p1, n * (x * p1 - p0) / (x**2 - 1)
+
+    x = np.cos(np.pi * (np.arange(1, n + 1) - 0.25) / (n + 0.5))
+    for _ in range(100):
+        p, dp = legendre(x)
+        dx = p / dp
+        x -= dx
+        if np.max(np.abs(dx)) < 1e-15:
+            break
+    _, dp = legendre(x)
+
+    nodes = (0.5 * (1 + x))[::-1].copy()
+    weights = (1 / ((1 - x**2) * dp**2))[::-1].copy()
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
+
+@lru_cache(maxsize=None)
+def clenshaw_curtis_rule(n: int) -> tuple[np.ndarray, np.ndarray]:
+    """This method calculates the nodes and weights of the Clenshaw-Curtis rule with the n+1
+       Chebyshev extreme points on [0, 1]. The weights are obtained from the moments of the
+       Chebyshev polynomials with one DCT-I. The result is cached and read-only.
+
+    Parameters
+    ----------
+    n : int
+        Degree of the interpolation polynomial (n+1 points)
+
+    Returns
+    -------
+    np.ndarray
+        Nodes in ascending order
+    np.ndarray
+        Weights
+    """
+    if n < 1:
+        raise ValueError("n must be positive.")
+    j = np.arange(n + 1)
+    moments = np.zeros(n + 1)
+    moments[::2] = 2 / (1 - j[::2]**2)
+    w = dct(moments, type=1) / n
+    w[[0, -1]] /= 2
+
+    nodes = (0.5 * (1 + np.cos(j * np.pi / n)))[::-1].copy()
+    nodes[[0, -1]] = 0.0, 1.0
+    weights = (0.5 * w)[::-1].copy()
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
+
+def gauss_legendre_quadrature(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, n: int) -> float:
+    """This method calculates the integral of 'f' from 'a' to 'b' using the Gauss-Legendre rule.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated
+    a : float
+        Lower bound of the integration interval
+    b : float
+        Upper bound of the integration interval
+    n : int
+        Amount of Gauss nodes
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    return _composite_quadrature(f, a, b, *gauss_legendre_rule(n), 1)
+
+def global_gauss_legendre_quadrature(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, n: int, m: int) -> float:
+    """This method calculates the integral of 'f' from 'a' to 'b' using the Gauss-Legendre rule
+       on m subintervals, with one call of 'f' on all nodes.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated
+    a : float
+        Lower bound of the integration interval
+    b : float
+        Upper bound of the integration interval
+    n : int
+        Amount of Gauss nodes per subinterval
+    m : int
+        Amount of subintervals
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    return _composite_quadrature(f, a, b, *gauss_legendre_rule(n), m)
+
+def clenshaw_curtis_quadrature(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, n: int) -> float:
+    """This method calculates the integral of 'f' from 'a' to 'b' using the Clenshaw-Curtis rule.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated
+    a : float
+        Lower bound of the integration interval
+    b : float
+        Upper bound of the integration interval
+    n : int
+        Degree of the interpolation polynomial (n+1 points)
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    return _composite_quadrature(f, a, b, *clenshaw_curtis_rule(n), 1)
+
+def global_clenshaw_curtis_quadrature(f: Callable[[np.ndarray], np.ndarray], a: float, b: float, n: int, m: int) -> float:
+    """This method calculates the integral of 'f' from 'a' to 'b' using the Clenshaw-Curtis rule
+       on m subintervals, with one call of 'f' on all distinct nodes.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated
+    a : float
+        Lower bound of the integration interval
+    b : float
+        Upper bound of the integration interval
+    n : int
+        Degree of the interpolation polynomial (n+1 points per subinterval)
+    m : int
+        Amount of subintervals
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    return _composite_quadrature(f, a, b, *clenshaw_curtis_rule(n), m)
+
+def _box(a: float | np.ndarray, b: float | np.ndarray) -> tuple[np.ndarray, np.ndarray, tuple, float]:
+    """Returns the bounds as float arrays, the shape of a single point (() for an interval,
+       (d,) for a d-dimensional box) and the volume of the domain."""
+    a, b = np.asarray(a, dtype=float), np.asarray(b, dtype=float)
+    if a.ndim > 1 or a.shape != b.shape:
+        raise ValueError("a and b must be scalars or 1d arrays of the same length.")
+    return a, b, a.shape, float(np.prod(b - a))
+
+def _monte_carlo_values(f: Callable[[np.ndarray], np.ndarray], a: float | np.ndarray, b: float | np.ndarray, n: int,
+                        rng: np.random.Generator, sampling: str, chunk_size: int) -> Iterator[np.ndarray]:
+    """Yields the sample values of a stream of n evaluations of 'f' in chunks. For antithetic
+       sampling a value is the mean of f(x) and f(a + b - x), i.e. it costs two evaluations."""
+    a, b, shape, _ = _box(a, b)
+    d = shape[0] if shape else 1
+    if sampling == "sobol":
+        engine = qmc.Sobol(d=d, scramble=True, rng=rng)
+    elif sampling == "halton":
+        engine = qmc.Halton(d=d, scramble=True, rng=rng)
+    elif sampling not in ("uniform", "antithetic"):
+        raise ValueError(f"Sampling '{sampling}' does not produce a stream of samples.")
+
+    n_values = n // 2 if sampling == "antithetic" else n
+    for start in range(0, n_values, chunk_size):
+        k = min(chunk_size, n_values - start)
+        if sampling in ("sobol", "halton"):
+            with warnings.catch_warnings():
+                # prefixes of any length are fine here, the balance warning does not apply
+                warnings.simplefilter("ignore", UserWarning)
+                u = engine.random(k).reshape((k,) + shape)
+        else:
+            u = rng.random((k,) + shape)
+        x = a + (b - a) * u
+        if sampling == "antithetic":
+            yield 0.5 * (np.asarray(f(x), dtype=float) + np.asarray(f(a + b - x), dtype=float))
+        else:
+            yield np.broadcast_to(np.asarray(f(x), dtype=float), (k,))
+
+def _merge_moments(n1: int, mean1: float, m2_1: float, n2: int, mean2: float, m2_2: float) -> tuple[int, float, float]:
+    """Merges count, mean and sum of squared deviations of two samples (Chan et al.)"""
+    n = n1 + n2
+    if n == 0:
+        return 0, 0.0, 0.0
+    delta = mean2 - mean1
+    return n, mean1 + delta * n2 / n, m2_1 + m2_2 + delta**2 * n1 * n2 / n
+
+def monte_carlo_running(f: Callable[[np.ndarray], np.ndarray], a: float | np.ndarray, b: float | np.ndarray, n: int,
+                        rng: np.random.Generator | None = None, sampling: str = "uniform",
+                        chunk_size: int = 2**16) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """This method calculates the Monte-Carlo approximation of the integral of 'f' from 'a' to 'b'
+       for every prefix of one stream of n samples, so a whole convergence curve costs n
+       evaluations of 'f'. 'f' is evaluated in vectorized chunks.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated, for a box it gets an (N, d) array
+    a : float or np.ndarray
+        Lower bound of the integration interval, or lower corner of a box in d dimensions
+    b : float or np.ndarray
+        Upper bound of the integration interval, or upper corner of a box in d dimensions
+    n : int
+        Number of function evaluations
+    rng : np.random.Generator
+        Random number generator (optional, a fresh unseeded one by default)
+    sampling : str
+        'uniform', 'antithetic', 'sobol' or 'halton' (scrambled quasi-Monte-Carlo)
+    chunk_size : int
+        Amount of samples per call of 'f'
+
+    Returns
+    -------
+    np.ndarray
+        Number of function evaluations of every prefix
+    np.ndarray
+        Approximated values of the integral
+    np.ndarray
+        Estimated standard errors (nan for a single sample)
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    volume = _box(a, b)[3]
+    estimates, errors = [], []
+    count, shift, s1, s2 = 0, None, 0.0, 0.0
+
+    for v in _monte_carlo_values(f, a, b, n, rng, sampling, chunk_size):
+        # running sums of the values shifted by the first one to limit cancellation
+        shift = v[0] if shift is None else shift
+        c1 = s1 + np.cumsum(v - shift)
+        c2 = s2 + np.cumsum((v - shift)**2)
+        k = count + np.arange(1, len(v) + 1)
+        mean = shift + c1 / k
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = np.maximum(c2 - c1**2 / k, 0.0) / (k - 1)
+        estimates.append(volume * mean)
+        errors.append(volume * np.sqrt(var / k))
+        count, s1, s2 = k[-1], c1[-1], c2[-1]
+
+    per_value = 2 if sampling == "antithetic" else 1
+    counts = per_value * np.arange(1, count + 1)
+    if count == 0:
+        return counts, np.zeros(0), np.zeros(0)
+    return counts, np.concatenate(estimates), np.concatenate(errors)
+
+def monte_carlo_estimate(f: Callable[[np.ndarray], np.ndarray], a: float | np.ndarray, b: float | np.ndarray, n: int,
+                         rng: np.random.Generator | None = None, sampling: str = "uniform",
+                         chunk_size: int = 2**16) -> tuple[float, float]:
+    """This method calculates the integral of 'f' from 'a' to 'b' with n vectorized Monte-Carlo
+       samples and estimates its standard error in the same pass.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated, for a box it gets an (N, d) array
+    a : float or np.ndarray
+        Lower bound of the integration interval, or lower corner of a box in d dimensions
+    b : float or np.ndarray
+        Upper bound of the integration interval, or upper corner of a box in d dimensions
+    n : int
+        Number of function evaluations
+    rng : np.random.Generator
+        Random number generator (optional, a fresh unseeded one by default)
+    sampling : str
+        'uniform', 'antithetic', 'stratified' (a regular grid of at most n/2 strata over as many axes as
+        n allows, all n samples spread evenly over the strata),
+        'sobol' or 'halton' (scrambled quasi-Monte-Carlo, the error is the plain sample estimate)
+    chunk_size : int
+        Amount of samples per call of 'f'
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    float
+        Estimated standard error
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    lo, hi, shape, volume = _box(a, b)
+
+    if sampling == "stratified":
+        if n < 2:
+            raise ValueError("Stratified sampling needs at least two samples.")
+        d = shape[0] if shape else 1
+        # stratify only as many axes as n/2 cells with at least two strata each allow
+        m = min(d, (n // 2).bit_length() - 1)
+        s = int((n // 2)**(1 / m) + 1e-9) if m else 1  # strata per stratified axis
+        k = s**m
+        r, extra = divmod(n, k)  # the first 'extra' cells get r + 1 samples
+        total, var = 0.0, 0.0
+        for first, last, per_cell in [(0, extra, r + 1), (extra, k, r)]:
+            step = max(1, chunk_size // per_cell)
+            for start in range(first, last, step):
+                cells = np.arange(start, min(start + step, last))[:, None] // s**np.arange(m) % s
+                u = rng.random((len(cells), per_cell, d))
+                u[:, :, :m] = (cells[:, None, :] + u[:, :, :m]) / s
+                x = lo + (hi - lo) * u.reshape((-1,) + shape)
+                fx = np.broadcast_to(np.asarray(f(x), dtype=float), (len(x),)).reshape(-1, per_cell)
+                total += np.sum(np.mean(fx, axis=1))
+                var += np.sum(np.var(fx, axis=1, ddof=1)) / per_cell
+        return volume * total / k, volume * np.sqrt(var) / k
+
+    count, mean, m2 = 0, 0.0, 0.0
+    for v in _monte_carlo_values(f, a, b, n, rng, sampling, chunk_size):
+        count, mean, m2 = _merge_moments(count, mean, m2, len(v), np.mean(v), np.sum((v - np.mean(v))**2))
+    stderr = np.sqrt(m2 / (count - 1) / count) if count > 1 else np.nan
+    return volume * mean, volume * stderr
+
+def _monte_carlo_worker(args: tuple) -> tuple[float, float]:
+    f, a, b, n, seed_sequence, sampling, chunk_size = args
+    return monte_carlo_estimate(f, a, b, n, np.random.default_rng(seed_sequence), sampling, chunk_size)
+
+def monte_carlo_parallel(f: Callable[[np.ndarray], np.ndarray], a: float | np.ndarray, b: float | np.ndarray, n: int, n_workers: int = 4,
+                         seed: int | None = None, sampling: str = "uniform", chunk_size: int = 2**16,
+                         executor: Executor | None = None) -> tuple[float, float]:
+    """This method distributes monte_carlo_estimate over n_workers, each with its own independent
+       stream spawned from one SeedSequence, so the result is reproducible for a fixed seed.
+       With the default process pool 'f' has to be picklable (e.g. a module-level function).
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated, for a box it gets an (N, d) array
+    a : float or np.ndarray
+        Lower bound of the integration interval, or lower corner of a box in d dimensions
+    b : float or np.ndarray
+        Upper bound of the integration interval, or upper corner of a box in d dimensions
+    n : int
+        Total number of function evaluations
+    n_workers : int
+        Number of independent streams
+    seed : int
+        Seed of the SeedSequence (optional)
+    sampling : str
+        Sampling method, see monte_carlo_estimate
+    chunk_size : int
+        Amount of samples per call of 'f'
+    executor : Executor
+        Executor that runs the workers (optional, a ProcessPoolExecutor by default)
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    float
+        Estimated standard error
+    """
+    streams = np.random.SeedSequence(seed).spawn(n_workers)
+    sizes = [n // n_workers + (i < n % n_workers) for i in range(n_workers)]
+    tasks = [(f, a, b, size, stream, sampling, chunk_size) for size, stream in zip(sizes, streams)]
+
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            results = list(pool.map(_monte_carlo_worker, tasks))
+    else:
+        results = list(executor.map(_monte_carlo_worker, tasks))
+
+    shares = np.array(sizes) / n
+    estimates = np.array([r[0] for r in results])
+    errors = np.array([r[1] for r in results])
+    return float(shares @ estimates), float(np.sqrt(np.sum((shares * errors)**2)))
+
+def _evaluate_points(f: Callable[[np.ndarray], np.ndarray], points: Callable[[np.ndarray], np.ndarray],
+                     weights: Callable[[np.ndarray], np.ndarray], n_points: int, chunk_size: int) -> float:
+    """Sums up weights(idx) * f(points(idx)) over the point indices 0..n_points-1, generating
+       and evaluating the points in batches of chunk_size, so only one batch is in memory."""
+    total = 0.0
+    for start in range(0, n_points, chunk_size):
+        idx = np.arange(start, min(start + chunk_size, n_points))
+        fx = np.broadcast_to(np.asarray(f(points(idx)), dtype=float), idx.shape)
+        total += float(fx @ weights(idx))
+    return total
+
+@lru_cache(maxsize=None)
+def _composite_newton_cotes_rule(n: int, m: int) -> tuple[np.ndarray, np.ndarray]:
+    """Nodes and weights of the composite Newton-Cotes rule of degree n with m subintervals on
+       [0, 1], the shared endpoints of neighbouring subintervals merged. Cached and read-only."""
+    if n < 1 or m < 1:
+        raise ValueError("n and m must be positive.")
+    w = _newton_cotes_table(n)
+    nodes = np.linspace(0, 1, n * m + 1)
+    weights = np.zeros(n * m + 1)
+    for i in range(m):
+        weights[n * i:n * (i + 1) + 1] += w / m
+    nodes.flags.writeable = False
+    weights.flags.writeable = False
+    return nodes, weights
+
+def tensor_product_quadrature(f: Callable[[np.ndarray], np.ndarray], a: np.ndarray, b: np.ndarray, x01: np.ndarray,
+                              w01: np.ndarray, chunk_size: int = 2**16) -> float:
+    """This method calculates the integral of 'f' over the box [a, b] with the tensor product of
+       the 1d rule with nodes x01 and weights w01 on [0, 1] in every direction. The k**d points
+       are never stored at once, they are generated from their flat index in batches.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated, it gets an (N, d) array
+    a : np.ndarray
+        Lower corner of the box
+    b : np.ndarray
+        Upper corner of the box
+    x01 : np.ndarray
+        Nodes of the 1d rule on [0, 1]
+    w01 : np.ndarray
+        Weights of the 1d rule on [0, 1]
+    chunk_size : int
+        Amount of points per call of 'f'
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    a, b, shape, volume = _box(np.atleast_1d(a), np.atleast_1d(b))
+    d, k = shape[0], len(x01)
+    x01, w01 = np.asarray(x01, dtype=float), np.asarray(w01, dtype=float)
+
+    def points(idx):
+        multi = np.stack(np.unravel_index(idx, (k,) * d), axis=-1)
+        return a + (b - a) * x01[multi]
+
+    def weights(idx):
+        return np.prod(w01[np.stack(np.unravel_index(idx, (k,) * d), axis=-1)], axis=-1)
+
+    return volume * _evaluate_points(f, points, weights, k**d, chunk_size)
+
+def tensor_newton_cotes_quadrature(f: Callable[[np.ndarray], np.ndarray], a: np.ndarray, b: np.ndarray, n: int, m: int,
+                                   chunk_size: int = 2**16) -> float:
+    """This method calculates the integral of 'f' over the box [a, b] with the tensor product of
+       the composite Newton-Cotes rule of degree n with m subintervals per direction, i.e. with
+       (n*m + 1)**d evaluations of 'f'.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated, it gets an (N, d) array
+    a : np.ndarray
+        Lower corner of the box
+    b : np.ndarray
+        Upper corner of the box
+    n : int
+        Degree of the interpolation polynomial
+    m : int
+        Amount of subintervals per direction
+    chunk_size : int
+        Amount of points per call of 'f'
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    return tensor_product_quadrature(f, a, b, *_composite_newton_cotes_rule(n, m), chunk_size)
+
+def _smolyak_indices(d: int, level: int) -> Iterator[tuple[int, ...]]:
+    """Yields the multi-indices i >= 1 of the Smolyak combination formula, i.e. those with
+       level <= |i| <= d + level - 1."""
+    def compose(prefix, remaining, budget):
+        if remaining == 0:
+            yield prefix
+            return
+        for i in range(1, budget - remaining + 2):
+            yield from compose(prefix + (i,), remaining - 1, budget - i)
+
+    q = d + level - 1
+    for index in compose((), d, q):
+        if sum(index) >= q - d + 1:
+            yield index
+
+@lru_cache(maxsize=None)
+def sparse_grid_rule(d: int, level: int) -> tuple[np.ndarray, np.ndarray]:
+    """This method calculates the Smolyak sparse grid on [0, 1]^d built from the nested
+       Clenshaw-Curtis rules (level 1 is the midpoint rule, level l > 1 has 2^(l-1) intervals).
+       Every node is keyed by its index on the finest 1d grid, so the points shared by the
+       tensor products of the combination formula are merged and their weights summed.
+       The result is cached and read-only.
+
+    Parameters
+    ----------
+    d : int
+        Dimension
+    level : int
+        Level of the sparse grid, polynomials of total degree 2*level - 1 are integrated exactly
+
+    Returns
+    -------
+    np.ndarray
+        (N, d) array of points
+    np.ndarray
+        Weights
+    """
+    if d < 1 or level < 1:
+        raise ValueError("d and level must be positive.")
+    n_finest = 2**max(level - 1, 1)
+
+    rules = [(np.array([n_finest // 2]), np.array([1.0]))]
+    for l in range(2, level + 1):
+        n = 2**(l - 1)
+        rules.append((np.arange(n + 1) * (n_finest // n), np.asarray(clenshaw_curtis_rule(n)[1])))
+
+    keys, weights = [], []
+    for index in _smolyak_indices(d, level):
+        coefficient = (-1)**(d + level - 1 - sum(index)) * math.comb(d - 1, d + level - 1 - sum(index))
+        grids = [rules[i - 1] for i in index]
+        keys.append(np.stack(np.meshgrid(*[g[0] for g in grids], indexing="ij"), axis=-1).reshape(-1, d))
+        product = coefficient * np.ones(())
+        for _, w in grids:
+            product = np.multiply.outer(product, w)
+        weights.append(product.ravel())
+
+    keys, inverse = np.unique(np.concatenate(keys), axis=0, return_inverse=True)
+    weights = np.bincount(inverse.ravel(), weights=np.concatenate(weights), minlength=len(keys))
+
+    points = 0.5 * (1 - np.cos(np.pi * keys / n_finest))
+    points[keys == 0], points[keys == n_finest] = 0.0, 1.0
+    points.flags.writeable = False
+    weights.flags.writeable = False
+    return points, weights
+
+def sparse_grid_quadrature(f: Callable[[np.ndarray], np.ndarray], a: np.ndarray, b: np.ndarray, level: int,
+                           chunk_size: int = 2**16) -> float:
+    """This method calculates the integral of 'f' over the box [a, b] with the Clenshaw-Curtis
+       Smolyak sparse grid of the given level. The number of points grows like
+       O(2^level * level^(d-1)) instead of O(2^(level*d)) for the full tensor product.
+
+    Parameters
+    ----------
+    f : Callable
+        The vectorized function to be integrated, it gets an (N, d) array
+    a : np.ndarray
+        Lower corner of the box
+    b : np.ndarray
+        Upper corner of the box
+    level : int
+        Level of the sparse grid
+    chunk_size : int
+        Amount of points per call of 'f'
+
+    Returns
+    -------
+    float
+        Approximated value of the integral
+    """
+    a, b, shape, volume = _box(np.atleast_1d(a), np.atleast_1d(b))
+    points, weights = sparse_grid_rule(shape[0], level)
+    return volume * _evaluate_points(f, lambda idx: a + (b - a) * points[idx], lambda idx: weights[idx],
+                                     len(weights), chunk_size)
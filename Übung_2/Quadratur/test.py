@@ -1,6 +1,13 @@
 import unittest
 import numpy as np
+from fractions import Fraction
 from Übung_2.Quadratur.quadrature import newton_cotes_weights, newton_cotes_quadrature, global_newton_cotes_quadrature, monte_carlo_quadrature
+from Übung_2.Quadratur.quadrature import newton_cotes_weights_exact, composite_newton_cotes_quadrature, adaptive_newton_cotes_quadrature
+from Übung_2.Quadratur.quadrature import (gauss_legendre_rule, gauss_legendre_quadrature, global_gauss_legendre_quadrature,
+                                         clenshaw_curtis_rule, clenshaw_curtis_quadrature, global_clenshaw_curtis_quadrature)
+from Übung_2.Quadratur.quadrature import monte_carlo_running, monte_carlo_estimate, monte_carlo_parallel
+from Übung_2.Quadratur.quadrature import tensor_newton_cotes_quadrature, sparse_grid_rule, sparse_grid_quadrature
+from concurrent.futures import ThreadPoolExecutor
 
 class TestInterpolation(unittest.TestCase):
     # These tests check whether or not input and output has the correct
@@ -12,6 +19,14 @@ class TestInterpolation(unittest.TestCase):
         # different quadrature rules.
         weights = newton_cotes_weights(1)
         self.assertTrue(np.allclose(weights, [.5, .5]))
+
+    def test_Newton_Cotes_Weights_Exact(self):
+        self.assertEqual(newton_cotes_weights_exact(2), (Fraction(1, 6), Fraction(2, 3), Fraction(1, 6)))
+        self.assertEqual(newton_cotes_weights_exact(4), tuple(Fraction(k, 90) for k in [7, 32, 12, 32, 7]))
+        weights = newton_cotes_weights(12)
+        weights[0] = 0.0  # the returned array is a copy of the cached table
+        self.assertTrue(np.isclose(newton_cotes_weights(12).sum(), 1.0))
+        self.assertTrue(np.allclose(newton_cotes_weights(12), newton_cotes_weights(12)[::-1]))
     
     def test_local_Newton_Cotes(self):
         f = lambda x: np.cos(x) + np.exp(x) + 3 * x ** 2
@@ -23,12 +38,93 @@ class TestInterpolation(unittest.TestCase):
         Ix = global_newton_cotes_quadrature(f, 0, 5, 7, 10)
         self.assertEqual(Ix, Ix)
 
+    def test_composite_Newton_Cotes(self):
+        f = lambda x: np.cos(x) + np.exp(x) + 3 * x ** 2
+        calls = []
+        g = lambda x: calls.append(np.shape(x)) or f(x)
+        Ix = composite_newton_cotes_quadrature(g, 0, 5, 7, 10)
+        self.assertEqual(calls, [(71,)])
+        self.assertAlmostEqual(Ix, global_newton_cotes_quadrature(f, 0, 5, 7, 10))
+
+    def test_adaptive_Newton_Cotes(self):
+        calls = []
+        f = lambda x: calls.append(len(x)) or np.sqrt(x)
+        Ix, err, n_evals = adaptive_newton_cotes_quadrature(f, 0, 1, tol=1e-8)
+        self.assertLess(abs(Ix - 2 / 3), 1e-7)  # error estimate, not a strict bound at the singularity
+        self.assertLessEqual(err, 1e-8)
+        self.assertEqual(n_evals, sum(calls))
+        self.assertLess(n_evals, 1000)
+
+    def test_Gauss_Legendre_Clenshaw_Curtis(self):
+        p = lambda x: 7 * x**9 - 2 * x**4 + x
+        Ip = 0.7 * 2**10 - 0.4 * 2**5 + 2
+        with self.subTest("Test degree of exactness"):
+            self.assertAlmostEqual(gauss_legendre_quadrature(p, 0, 2, 5), Ip)
+            self.assertAlmostEqual(clenshaw_curtis_quadrature(p, 0, 2, 9), Ip)
+        with self.subTest("Test rules against numpy and Simpson"):
+            x, w = np.polynomial.legendre.leggauss(30)
+            nodes, weights = gauss_legendre_rule(30)
+            self.assertTrue(np.allclose(nodes, (1 + x) / 2) and np.allclose(weights, w / 2))
+            self.assertTrue(np.allclose(clenshaw_curtis_rule(2)[1], [1 / 6, 2 / 3, 1 / 6]))
+            self.assertIs(gauss_legendre_rule(30), gauss_legendre_rule(30))
+        with self.subTest("Test global rules"):
+            f = lambda x: np.cos(x) + np.exp(x) + 3 * x ** 2
+            Ix = global_newton_cotes_quadrature(f, 0, 5, 20, 10)
+            self.assertAlmostEqual(global_gauss_legendre_quadrature(f, 0, 5, 10, 10), Ix)
+            self.assertAlmostEqual(global_clenshaw_curtis_quadrature(f, 0, 5, 20, 10), Ix)
+
     def test_Monte_Carlo(self):
         f = lambda x: np.cos(x) + np.exp(x) + 3 * x ** 2
         np.random.seed(42)  # Fixed seed for reproducibility
         Ix = monte_carlo_quadrature(f, 0, 5, 1000)
         self.assertEqual(Ix, Ix)
 
+    def test_Monte_Carlo_Engine(self):
+        f = lambda x: np.cos(x) + np.exp(x) + 3 * x ** 2
+        Ix = np.sin(5) + np.exp(5) + 125 - 1
+        for sampling in ["uniform", "antithetic", "sobol", "halton"]:
+            counts, estimates, errors = monte_carlo_running(f, 0, 5, 10000, np.random.default_rng(0), sampling, chunk_size=999)
+            self.assertEqual(counts[-1], 10000)
+            estimate, error = monte_carlo_estimate(f, 0, 5, 10000, np.random.default_rng(0), sampling)
+            self.assertAlmostEqual(estimate, estimates[-1])
+            self.assertAlmostEqual(error, errors[-1])
+            self.assertLess(abs(estimate - Ix), 5 * error)
+        # every prefix of the stream is the plain sample mean
+        x = 5 * np.random.default_rng(1).random(50)
+        _, estimates, errors = monte_carlo_running(f, 0, 5, 50, np.random.default_rng(1), chunk_size=7)
+        self.assertTrue(np.allclose(estimates, 5 * np.cumsum(f(x)) / np.arange(1, 51)))
+        self.assertAlmostEqual(errors[-1], 5 * np.std(f(x), ddof=1) / np.sqrt(50))
+        estimate, error = monte_carlo_estimate(f, 0, 5, 10000, np.random.default_rng(0), "stratified")
+        self.assertLess(abs(estimate - Ix), 1e-2)
+        with self.assertRaises(ValueError):
+            monte_carlo_running(f, 0, 5, 100, sampling="stratified")
+        with ThreadPoolExecutor(2) as executor:
+            first = monte_carlo_parallel(f, 0, 5, 10000, 4, seed=3, executor=executor)
+            second = monte_carlo_parallel(f, 0, 5, 10000, 4, seed=3, executor=executor)
+        self.assertEqual(first, second)
+        self.assertLess(abs(first[0] - Ix), 5 * first[1])
+
+    def test_Multidimensional(self):
+        f = lambda x: np.exp(x.sum(axis=1))
+        a, b = np.zeros(4), np.full(4, 0.5)
+        Ix = (np.exp(0.5) - 1)**4
+        self.assertAlmostEqual(tensor_newton_cotes_quadrature(f, a, b, 2, 3, chunk_size=100), Ix, places=6)
+        self.assertAlmostEqual(sparse_grid_quadrature(f, a, b, 5, chunk_size=100), Ix, places=8)
+        # sparse grids integrate polynomials of total degree 2*level - 1 exactly
+        g = lambda x: x[:, 0]**3 * x[:, 1]**2 * x[:, 2]**2
+        self.assertAlmostEqual(sparse_grid_quadrature(g, np.zeros(3), np.ones(3), 4), 1 / 36)
+        points, weights = sparse_grid_rule(10, 3)
+        self.assertEqual(points.shape, (221, 10))
+        self.assertAlmostEqual(weights.sum(), 1.0)
+        estimate, error = monte_carlo_estimate(f, a, b, 10000, np.random.default_rng(0), "stratified")
+        self.assertLess(abs(estimate - Ix), 5 * error)
+        # stratified sampling spends the whole budget even if n does not fill a grid over all axes
+        calls = []
+        g = lambda x: calls.append(len(x)) or np.exp(x.sum(axis=1))
+        estimate, error = monte_carlo_estimate(g, np.zeros(10), np.full(10, 0.5), 1000, np.random.default_rng(0), "stratified")
+        self.assertEqual(sum(calls), 1000)
+        self.assertLess(abs(estimate - (np.exp(0.5) - 1)**10), 5 * error)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -4,8 +4,14 @@ if version_info[0] < 3 or version_info[1] < 10:
     raise Exception("Must be using Python 3.10 or newer")
 ###########################################################
 
+import math
 import numpy as np
-from typing import Callable
+import scipy.linalg
+import scipy.sparse
+import scipy.sparse.linalg
+from fractions import Fraction
+from functools import lru_cache
+from typing import Callable, Iterator
 from scipy.optimize import fsolve
 
 def forward_difference_quotient(f: Callable[[float],float], x: float, h:float) -> float:
@@ -53,26 +59,165 @@ def central_difference_quotient(f: Callable[[float],float], x: float, h:float) -
     cdq = (f(x + h) - f(x - h)) / (2 * h)
     return cdq
 
-def explicit_euler(rhs: Callable[[float], float], y0: float, t0: float, T: float, N: int) -> [np.ndarray[float], np.ndarray[float]]:
+@lru_cache(maxsize=None)
+def stencil_weights(offsets: tuple[int, ...], derivative: int = 1) -> np.ndarray:
+    """
+        This method shall compute the weights w of the finite difference stencil
+        f^(derivative)(x) ~ sum_j w_j f(x + offsets_j h) / h^derivative.
+        The moment conditions are solved exactly in rational arithmetic; the result is cached
+        and read-only.
+    Input:
+        offsets : tuple    -> Distinct integer offsets of the stencil points
+        derivative : int   -> Order of the derivative
+    Output:
+        w : np.ndarray     -> Weights of the stencil
+    """
+    n = len(offsets)
+    if len(set(offsets)) != n or not 0 < derivative < n:
+        raise ValueError("The stencil needs more distinct offsets than the order of the derivative.")
+    # Gauss-Jordan elimination on sum_j w_j o_j^k = k! delta_{k, derivative}
+    M = [[Fraction(o)**k for o in offsets] + [Fraction(math.factorial(k) if k == derivative else 0)]
+         for k in range(n)]
+    for col in range(n):
+        pivot = next(r for r in range(col, n) if M[r][col] != 0)
+        M[col], M[pivot] = M[pivot], M[col]
+        M[col] = [v / M[col][col] for v in M[col]]
+        for r in range(n):
+            if r != col and M[r][col] != 0:
+                M[r] = [v - M[r][col] * p for v, p in zip(M[r], M[col])]
+    w = np.array([float(row[-1]) for row in M])
+    w.flags.writeable = False
+    return w
+
+
+def central_stencil(derivative: int = 1, accuracy: int = 2) -> tuple[np.ndarray, np.ndarray]:
+    """
+        This method shall return the offsets and weights of the central difference stencil
+        of the given derivative with an error of order O(h^accuracy).
+    Input:
+        derivative : int   -> Order of the derivative
+        accuracy : int     -> Even order of accuracy
+    Output:
+        offsets : np.ndarray -> Offsets of the stencil points
+        w : np.ndarray       -> Weights of the stencil
+    """
+    if accuracy < 2 or accuracy % 2:
+        raise ValueError("The accuracy of a central stencil must be a positive even number.")
+    p = (derivative - 1) // 2 + accuracy // 2
+    offsets = tuple(range(-p, p + 1))
+    return np.array(offsets), stencil_weights(offsets, derivative)
+
+
+def stencil_derivative(f: Callable[[np.ndarray], np.ndarray], x: float | np.ndarray, h: float, derivative: int = 1,
+                       accuracy: int = 2) -> np.ndarray:
+    """
+        This method shall approximate the derivative of f at all points x with the central
+        stencil of the given accuracy. All stencil points of all x are evaluated in one call of f,
+        which must be vectorized.
+    Input:
+        f : Callable        -> Vectorized function of which the derivative shall be approximated
+        x : float/np.ndarray -> Positions at which the derivative shall be approximated
+        h : float           -> Stepwidth
+        derivative : int    -> Order of the derivative
+        accuracy : int      -> Even order of accuracy
+    Output:
+        df : np.ndarray     -> Approximation of f^(derivative)(x)
+    """
+    if h <= 0:
+        raise ValueError("Stepwidth h must be positive.")
+    offsets, w = central_stencil(derivative, accuracy)
+    x = np.asarray(x, dtype=float)
+    fx = np.asarray(f(x[..., None] + h * offsets), dtype=float)
+    return fx @ w / h**derivative
+
+
+def richardson_derivative(f: Callable[[np.ndarray], np.ndarray], x: float | np.ndarray, h: float = 0.1,
+                          levels: int = 4) -> tuple[np.ndarray, np.ndarray]:
+    """
+        This method shall approximate f'(x) with Richardson extrapolation of the central
+        difference quotients with the stepwidths h, h/2, ..., h/2^(levels-1). All 2 * levels points
+        per x are evaluated in one call of f; every column of the table reuses the previous one,
+        raising the order by two. The difference of the last two diagonal entries serves as error estimate.
+    Input:
+        f : Callable         -> Vectorized function of which the derivative shall be approximated
+        x : float/np.ndarray -> Positions at which the derivative shall be approximated
+        h : float            -> Largest stepwidth
+        levels : int         -> Number of stepwidths
+    Output:
+        df : np.ndarray      -> Approximation of f'(x)
+        err : np.ndarray     -> Estimate of the error
+    """
+    if h <= 0:
+        raise ValueError("Stepwidth h must be positive.")
+    if levels < 1:
+        raise ValueError("levels must be positive.")
+    x = np.asarray(x, dtype=float)
+    steps = h / 2.0**np.arange(levels)
+    fx = np.asarray(f(x[..., None] + np.concatenate([steps, -steps])), dtype=float)
+    table = [(fx[..., :levels] - fx[..., levels:]) / (2 * steps)]
+    for k in range(1, levels):
+        prev = table[-1]
+        table.append(prev[..., 1:] + (prev[..., 1:] - prev[..., :-1]) / (4**k - 1))
+    df = table[-1][..., 0]
+    err = np.abs(df - table[-2][..., -1]) if levels > 1 else np.full(x.shape, np.nan)
+    return df, err
+
+
+def complex_step_derivative(f: Callable[[np.ndarray], np.ndarray], x: float | np.ndarray, h: float = 1e-20) -> np.ndarray:
+    """
+        This method shall approximate f'(x) with the complex step Im(f(x + ih)) / h.
+        f must be analytic and accept complex arguments. There is no subtraction, so h can be
+        chosen tiny and the result is accurate to machine precision.
+    Input:
+        f : Callable         -> Vectorized analytic function of which the derivative shall be approximated
+        x : float/np.ndarray -> Positions at which the derivative shall be approximated
+        h : float            -> Stepwidth
+    Output:
+        df : np.ndarray      -> Approximation of f'(x)
+    """
+    if h <= 0:
+        raise ValueError("Stepwidth h must be positive.")
+    return np.imag(f(np.asarray(x, dtype=float) + 1j * h)) / h
+
+
+def explicit_euler(rhs: Callable[[float, np.ndarray], np.ndarray], y0: float | np.ndarray, t0: float, T: float, N: int,
+                   save_every: int | None = 1) -> [np.ndarray[float], np.ndarray[float]]:
     """
         This method shall implement the explicit Euler method.
+        The state may be a scalar, a vector of shape (dim,) or an ensemble of shape (batch, dim);
+        rhs is evaluated once per step on the whole state array and must return an array of
+        the same shape. Only every save_every-th step (and the final one) is stored.
     Input:
-        rhs : Callable -> Right-hand side of the ODE y'(t) = rhs(t, y)
-        y0 : float     -> Initial value y(t0)
-        t0 : float     -> Initial moment in time
-        T : float      -> Final moment in time
-        N : int        -> Number of time steps
+        rhs : Callable        -> Right-hand side of the ODE y'(t) = rhs(t, y)
+        y0 : float/np.ndarray -> Initial value y(t0)
+        t0 : float            -> Initial moment in time
+        T : float             -> Final moment in time
+        N : int               -> Number of time steps
+        save_every : int      -> Store every save_every-th step, None stores only the final state
     Output:
-        t : np.ndarray -> Array of moments in time
-        y : np.ndarray -> Array of the solution
+        t : np.ndarray -> Array of the stored moments in time
+        y : np.ndarray -> Array of the solution at these moments, shape (len(t),) + np.shape(y0)
     """
+    if save_every is not None and save_every < 1:
+        raise ValueError("save_every must be positive or None.")
     h = (T - t0) / N
-    t = np.linspace(t0, T, N + 1)
-    y = np.zeros(N + 1)
-    y[0] = y0
 
-    for i in range(N):
-        y[i + 1] = y[i] + h * rhs(t[i], y[i])
+    saved = np.array([N]) if save_every is None else np.arange(0, N + 1, save_every)
+    if saved[-1] != N:
+        saved = np.append(saved, N)
+    y = np.empty((len(saved),) + np.shape(y0))
+    # the time grid is computed on the fly (t0 + i h as in np.linspace), only the stored times are kept
+    t = t0 + h * saved
+    t[-1] = T
+
+    state = np.array(y0, dtype=float)
+    j = 0
+    for i in range(N + 1):
+        if i == saved[j]:
+            y[j] = state
+            j += 1
+        if i < N:
+            state += h * np.asarray(rhs(t0 + i * h, state))
 
     return t, y
 
@@ -105,3 +250,491 @@ def implicit_euler(rhs: Callable[[float], float], y0: float, t0: float, T: float
         y[i + 1] = fsolve(F, y_guess)[0]  # fsolve returns an array, take scalar
 
     return t, y
+
+
+def _factorize(M) -> Callable[[np.ndarray], np.ndarray]:
+    """
+        Factorizes the iteration matrix M once and returns a solver for M s = r.
+        Sparse matrices get a sparse LU, dense ones a dense LU with partial pivoting.
+    """
+    if scipy.sparse.issparse(M):
+        try:
+            return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(M)).solve
+        except RuntimeError as e:
+            raise ValueError(f"Iteration matrix is singular: {e}")
+
+    lu, piv = scipy.linalg.lu_factor(np.asarray(M, dtype=float), check_finite=False)
+    if np.any(np.abs(np.diag(lu)) < 1e-14):
+        raise ValueError("Iteration matrix is singular. Cannot proceed.")
+    return lambda r: scipy.linalg.lu_solve((lu, piv), r, check_finite=False)
+
+
+def _jacobian_fd(f: Callable[[float, np.ndarray], np.ndarray], t: float, y: np.ndarray, fy: np.ndarray) -> np.ndarray:
+    """
+        Approximates the Jacobian of f(t, .) at the flattened state y with forward differences,
+        one column per perturbed component. f maps flattened states to flattened derivatives.
+    """
+    J = np.empty((len(y), len(y)))
+    for j in range(len(y)):
+        h = np.sqrt(np.finfo(float).eps) * max(1.0, abs(y[j]))
+        yh = y.copy()
+        yh[j] += h
+        J[:, j] = (f(t, yh) - fy) / h
+    return J
+
+
+class _SimplifiedNewton:
+    """
+        Solves the implicit equations z - gamma rhs(t, z) = c of implicit time steps with a
+        simplified Newton iteration. The factorization of I - gamma J is kept between calls and
+        renewed at the current iterate when gamma changes or when the iteration contracts slower
+        than max_rate. If maxiter iterations do not suffice, the solve is finished from the
+        current iterate with a damped full Newton iteration with a budget of its own.
+    """
+    def __init__(self, rhs: Callable, jac: Callable | None, shape: tuple, tol: float, maxiter: int, max_rate: float):
+        self.rhs, self.jac, self.shape = rhs, jac, shape
+        self.tol, self.maxiter, self.max_rate = tol, maxiter, max_rate
+        self.n = int(np.prod(shape))
+        self.lu, self.gamma = None, None
+
+    def f(self, t: float, z: np.ndarray) -> np.ndarray:
+        return np.asarray(self.rhs(t, z.reshape(self.shape)), dtype=float).ravel()
+
+    def factorize(self, t: float, z: np.ndarray, gamma: float) -> None:
+        J = self.jac(t, z.reshape(self.shape)) if self.jac is not None else _jacobian_fd(self.f, t, z, self.f(t, z))
+        if scipy.sparse.issparse(J):
+            self.lu = _factorize(scipy.sparse.identity(self.n, format="csc") - gamma * J)
+        else:
+            self.lu = _factorize(np.eye(self.n) - gamma * np.atleast_2d(np.asarray(J, dtype=float)))
+        self.gamma = gamma
+
+    def converged(self, dz: np.ndarray, z: np.ndarray) -> bool:
+        return self.n == 0 or np.max(np.abs(dz)) <= self.tol * max(1.0, np.max(np.abs(z)))
+
+    def solve(self, t: float, gamma: float, c: np.ndarray, z0: np.ndarray) -> tuple[np.ndarray, int, int]:
+        """Returns the solution, the number of iterations and the number of factorizations."""
+        iterations = factorizations = 0
+        if self.gamma != gamma:
+            self.lu = None
+        z = z0.copy()
+        previous = None
+        for _ in range(self.maxiter):
+            if self.lu is None:
+                self.factorize(t, z, gamma)
+                factorizations += 1
+                previous = None
+            dz = self.lu(c - z + gamma * self.f(t, z))
+            norm = np.max(np.abs(dz)) if self.n else 0.0
+            iterations += 1
+            if previous is not None and norm > previous:
+                # the iteration diverges: discard the step and renew the matrix where it started
+                self.lu = None
+                continue
+            z += dz
+            if self.converged(dz, z):
+                return z, iterations, factorizations
+            if previous is not None and norm > self.max_rate * previous:
+                self.lu = None
+            previous = norm
+
+        # damped full Newton iteration on the residual z - gamma rhs(t, z) - c from the current iterate
+        residual = lambda z: z - gamma * self.f(t, z) - c
+        r = residual(z)
+        for _ in range(self.maxiter):
+            self.factorize(t, z, gamma)
+            factorizations += 1
+            dz = -self.lu(r)
+            iterations += 1
+            sigma = 1.0
+            while True:
+                z_new = z + sigma * dz
+                r_new = residual(z_new)
+                if np.linalg.norm(r_new) <= (1 - sigma / 2) * np.linalg.norm(r) or sigma < 1e-4:
+                    break
+                sigma /= 2
+            z, r = z_new, r_new
+            if sigma == 1.0 and self.converged(dz, z):
+                return z, iterations, factorizations
+        raise RuntimeError(f"Newton iteration did not converge at t = {t}.")
+
+
+def implicit_euler_newton(rhs: Callable[[float, np.ndarray], np.ndarray], y0: float | np.ndarray, t0: float, T: float,
+                          N: int, jac: Callable | None = None, tol: float = 1e-10, maxiter: int = 10,
+                          max_rate: float = 0.5) -> tuple[np.ndarray, np.ndarray, dict]:
+    """
+        This method shall implement the implicit Euler method with a simplified Newton iteration.
+        The iteration matrix I - hJ is factorized once and reused across steps as long as
+        the iteration contracts with a rate of at most max_rate. Otherwise, or if it does not
+        converge within maxiter iterations, J is reevaluated at the current state and the
+        step is repeated; if that fails too, the step is done with a full Newton iteration.
+        Sparse Jacobians are factorized with a sparse LU.
+    Input:
+        rhs : Callable        -> Right-hand side of the ODE y'(t) = rhs(t, y)
+        y0 : float/np.ndarray -> Initial value y(t0)
+        t0 : float            -> Initial moment in time
+        T : float             -> Final moment in time
+        N : int               -> Number of time steps
+        jac : Callable        -> Jacobian jac(t, y) of rhs, dense or sparse (optional, forward differences otherwise)
+        tol : float           -> Tolerance for the Newton correction (relative to max(1, |y|))
+        maxiter : int         -> Maximum Newton iterations per attempt
+        max_rate : float      -> Contraction rate above which the iteration matrix is renewed
+    Output:
+        t : np.ndarray -> Array of moments in time
+        y : np.ndarray -> Array of the solution, shape (N + 1,) + np.shape(y0)
+        stats : dict   -> Newton iterations and factorizations per step
+    """
+    if N < 1:
+        raise ValueError("N must be positive.")
+    h = (T - t0) / N
+    t = np.linspace(t0, T, N + 1)
+    y = np.empty((N + 1,) + np.shape(y0))
+    y[0] = y0
+    state = np.array(y0, dtype=float).ravel()
+    newton = _SimplifiedNewton(rhs, jac, np.shape(y0), tol, maxiter, max_rate)
+    stats = {"newton_iterations": np.zeros(N, dtype=int), "factorizations": np.zeros(N, dtype=int)}
+
+    for i in range(N):
+        state, stats["newton_iterations"][i], stats["factorizations"][i] = newton.solve(t[i + 1], h, state, state)
+        y[i + 1] = state.reshape(np.shape(y0))
+
+    return t, y, stats
+
+
+# Butcher tableaus of the embedded pairs: nodes c, coefficients A, weights b of the propagated
+# solution, error weights E (including the FSAL stage), dense output matrix P and the order
+# of the error estimator.
+_RK_PAIRS = {
+    "RK23": {
+        "c": np.array([0, 1 / 2, 3 / 4]),
+        "A": np.array([[0, 0, 0], [1 / 2, 0, 0], [0, 3 / 4, 0]]),
+        "b": np.array([2 / 9, 1 / 3, 4 / 9]),
+        "E": np.array([5 / 72, -1 / 12, -1 / 9, 1 / 8]),
+        "P": np.array([[1, -4 / 3, 5 / 9], [0, 1, -2 / 3], [0, 4 / 3, -8 / 9], [0, -1, 1]]),
+        "error_order": 2,
+    },
+    "RK45": {
+        "c": np.array([0, 1 / 5, 3 / 10, 4 / 5, 8 / 9, 1]),
+        "A": np.array([[0, 0, 0, 0, 0],
+                       [1 / 5, 0, 0, 0, 0],
+                       [3 / 40, 9 / 40, 0, 0, 0],
+                       [44 / 45, -56 / 15, 32 / 9, 0, 0],
+                       [19372 / 6561, -25360 / 2187, 64448 / 6561, -212 / 729, 0],
+                       [9017 / 3168, -355 / 33, 46732 / 5247, 49 / 176, -5103 / 18656]]),
+        "b": np.array([35 / 384, 0, 500 / 1113, 125 / 192, -2187 / 6784, 11 / 84]),
+        "E": np.array([-71 / 57600, 0, 71 / 16695, -71 / 1920, 17253 / 339200, -22 / 525, 1 / 40]),
+        "P": np.array([[1, -8048581381 / 2820520608, 8663915743 / 2820520608, -12715105075 / 11282082432],
+                       [0, 0, 0, 0],
+                       [0, 131558114200 / 32700410799, -68118460800 / 10900136933, 87487479700 / 32700410799],
+                       [0, -1754552775 / 470086768, 14199869525 / 1410260304, -10690763975 / 1880347072],
+                       [0, 127303824393 / 49829197408, -318862633887 / 49829197408, 701980252875 / 199316789632],
+                       [0, -282668133 / 205662961, 2019193451 / 616988883, -1453857185 / 822651844],
+                       [0, 40617522 / 29380423, -110615467 / 29380423, 69997945 / 29380423]]),
+        "error_order": 4,
+    },
+}
+
+
+def _rms(x: np.ndarray) -> float:
+    return float(np.sqrt(np.mean(np.square(x)))) if np.size(x) else 0.0
+
+
+def embedded_runge_kutta(rhs: Callable[[float, np.ndarray], np.ndarray], y0: float | np.ndarray, t0: float, T: float,
+                         method: str = "RK45", rtol: float = 1e-6, atol: float = 1e-9, h0: float | None = None,
+                         t_eval: np.ndarray | None = None, max_steps: int = 10**6) -> [np.ndarray[float], np.ndarray[float]]:
+    """
+        This method shall implement an embedded Runge-Kutta pair with adaptive step size,
+        Bogacki-Shampine 3(2) ('RK23') or Dormand-Prince 5(4) ('RK45'). The last stage of an
+        accepted step is reused as the first stage of the next one (FSAL). Solution values at
+        the times t_eval are computed with the dense output interpolant of the step containing
+        them, so they do not restrict the step size.
+    Input:
+        rhs : Callable        -> Right-hand side of the ODE y'(t) = rhs(t, y)
+        y0 : float/np.ndarray -> Initial value y(t0)
+        t0 : float            -> Initial moment in time
+        T : float             -> Final moment in time
+        method : str          -> 'RK23' or 'RK45'
+        rtol : float          -> Relative tolerance of the local error
+        atol : float          -> Absolute tolerance of the local error
+        h0 : float            -> Initial step size (optional, estimated otherwise)
+        t_eval : np.ndarray   -> Ascending output times in [t0, T] (optional, the accepted steps otherwise)
+        max_steps : int       -> Maximum number of (accepted and rejected) steps
+    Output:
+        t : np.ndarray -> Array of moments in time
+        y : np.ndarray -> Array of the solution, shape (len(t),) + np.shape(y0)
+    """
+    if method not in _RK_PAIRS:
+        raise ValueError(f"Unknown method '{method}'. Use one of {list(_RK_PAIRS)}.")
+    if T <= t0:
+        raise ValueError("T must be larger than t0.")
+    pair = _RK_PAIRS[method]
+    c, A, b, E, P = pair["c"], pair["A"], pair["b"], pair["E"], pair["P"]
+    exponent = -1 / (pair["error_order"] + 1)
+    n_stages = len(c)
+
+    y = np.array(y0, dtype=float)
+    K = np.empty((n_stages + 1,) + y.shape)
+    K[0] = rhs(t0, y)
+
+    if h0 is None:
+        # initial step size from the scale of y and y' (Hairer, Norsett & Wanner)
+        scale = atol + rtol * np.abs(y)
+        d0, d1 = _rms(y / scale), _rms(K[0] / scale)
+        h = 1e-6 if d0 < 1e-5 or d1 < 1e-5 else 0.01 * d0 / d1
+        h = min(h, T - t0)
+        d2 = _rms((np.asarray(rhs(t0 + h, y + h * K[0])) - K[0]) / scale) / h
+        h1 = max(1e-6, h * 1e-3) if max(d1, d2) <= 1e-15 else (0.01 / max(d1, d2))**(-exponent)
+        h = min(100 * h, h1, T - t0)
+    else:
+        h = h0
+
+    if t_eval is not None:
+        t_eval = np.asarray(t_eval, dtype=float)
+        if np.any(np.diff(t_eval) < 0) or (len(t_eval) and (t_eval[0] < t0 or t_eval[-1] > T)):
+            raise ValueError("t_eval must be ascending and lie in [t0, T].")
+        ts, ys = t_eval, np.empty((len(t_eval),) + y.shape)
+        j = np.searchsorted(t_eval, t0, side="right")
+        ys[:j] = y
+    else:
+        ts, ys = [t0], [y.copy()]
+
+    t = t0
+    for _ in range(max_steps):
+        if t >= T:
+            break
+        h = min(h, T - t)
+        for s in range(1, n_stages):
+            K[s] = rhs(t + c[s] * h, y + h * np.tensordot(A[s, :s], K[:s], axes=1))
+        y_new = y + h * np.tensordot(b, K[:n_stages], axes=1)
+        t_new = T if T - (t + h) <= 1e-14 * abs(T) else t + h
+        K[n_stages] = rhs(t_new, y_new)
+
+        scale = atol + rtol * np.maximum(np.abs(y), np.abs(y_new))
+        err = _rms(h * np.tensordot(E, K, axes=1) / scale)
+        if err > 1:
+            h *= max(0.2, 0.9 * err**exponent)
+            if h < 1e2 * np.finfo(float).eps * abs(t):
+                raise RuntimeError(f"Step size too small at t = {t}.")
+            continue
+
+        if t_eval is not None:
+            k = np.searchsorted(t_eval, t_new, side="right")
+            if k > j:
+                # dense output y(t + theta h) = y + h K^T P (theta, theta^2, ...)
+                theta = (t_eval[j:k] - t) / h
+                powers = np.cumprod(np.repeat(theta[:, None], P.shape[1], axis=1), axis=1)
+                Q = np.tensordot(P, K, axes=([0], [0]))
+                ys[j:k] = y + h * np.tensordot(powers, Q, axes=1)
+                j = k
+        else:
+            ts.append(t_new)
+            ys.append(y_new.copy())
+
+        t, y = t_new, y_new
+        K[0] = K[n_stages]
+        h *= min(10.0, 0.9 * err**exponent) if err > 0 else 10.0
+    else:
+        if t < T:
+            raise RuntimeError(f"Maximum number of steps ({max_steps}) exceeded.")
+
+    return np.asarray(ts), np.asarray(ys)
+
+
+# Coefficients of the multistep methods, newest value first
+_ADAMS_BASHFORTH = {1: [1], 2: [3 / 2, -1 / 2], 3: [23 / 12, -16 / 12, 5 / 12], 4: [55 / 24, -59 / 24, 37 / 24, -9 / 24]}
+_ADAMS_MOULTON = {1: [1], 2: [1 / 2, 1 / 2], 3: [5 / 12, 8 / 12, -1 / 12], 4: [9 / 24, 19 / 24, -5 / 24, 1 / 24]}
+# BDF: y_{n+1} = sum_j alpha_j y_{n-j} + beta h f(t_{n+1}, y_{n+1})
+_BDF = {1: ([1], 1), 2: ([4 / 3, -1 / 3], 2 / 3), 3: ([18 / 11, -9 / 11, 2 / 11], 6 / 11),
+        4: ([48 / 25, -36 / 25, 16 / 25, -3 / 25], 12 / 25)}
+
+
+def _stream(advance: Callable[[int, tuple], tuple], state: tuple, t0: float, T: float, N: int,
+            block_size: int) -> Iterator[tuple[np.ndarray, ...]]:
+    """
+        Runs advance(i, state) -> state for the steps i = 0, ..., N-1 and yields the times and
+        states in blocks of block_size rows, (t, y) or (t, q, p) for a state tuple (q, p).
+        Only one block is held in memory, the time grid included.
+    """
+    if N < 1 or block_size < 1:
+        raise ValueError("N and block_size must be positive.")
+    h = (T - t0) / N
+    for start in range(0, N + 1, block_size):
+        stop = min(start + block_size, N + 1)
+        t = t0 + h * np.arange(start, stop)
+        if stop == N + 1:
+            t[-1] = T
+        buffers = [np.empty((stop - start,) + np.shape(x)) for x in state]
+        for i in range(start, stop):
+            if i > 0:
+                state = advance(i - 1, state)
+            for buffer, x in zip(buffers, state):
+                buffer[i - start] = x
+        yield (t, *buffers)
+
+
+def _combine(coefficients, values: list[np.ndarray]) -> np.ndarray:
+    """Linear combination of a few past values; cheaper than stacking them for tensordot."""
+    total = coefficients[0] * values[0]
+    for c, v in zip(coefficients[1:], values[1:]):
+        total = total + c * v
+    return total
+
+
+def _rk4_step(rhs: Callable, t: float, y: np.ndarray, h: float, fy: np.ndarray) -> np.ndarray:
+    k2 = np.asarray(rhs(t + h / 2, y + h / 2 * fy))
+    k3 = np.asarray(rhs(t + h / 2, y + h / 2 * k2))
+    k4 = np.asarray(rhs(t + h, y + h * k3))
+    return y + h / 6 * (fy + 2 * k2 + 2 * k3 + k4)
+
+
+def adams_blocks(rhs: Callable[[float, np.ndarray], np.ndarray], y0: float | np.ndarray, t0: float, T: float, N: int,
+                 order: int = 4, corrector: bool = False, block_size: int = 4096) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+        This method shall implement the Adams-Bashforth method of the given order, or with
+        corrector=True the Adams-Bashforth-Moulton predictor-corrector (PECE) method.
+        Past evaluations of rhs are reused, so a step costs one (two for PECE) evaluations.
+        The first order-1 steps are done with the classical Runge-Kutta method. The solution
+        is streamed as blocks (t, y) of at most block_size steps, e.g. into write_blocks.
+    Input:
+        rhs : Callable        -> Right-hand side of the ODE y'(t) = rhs(t, y)
+        y0 : float/np.ndarray -> Initial value y(t0)
+        t0 : float            -> Initial moment in time
+        T : float             -> Final moment in time
+        N : int               -> Number of time steps
+        order : int           -> Order of the method (1 to 4)
+        corrector : bool      -> Correct with the Adams-Moulton method of the same order
+        block_size : int      -> Number of time steps per block
+    Output:
+        blocks : Iterator     -> Blocks (t, y) of moments in time and solution values
+    """
+    if order not in _ADAMS_BASHFORTH:
+        raise ValueError(f"order must be one of {list(_ADAMS_BASHFORTH)}.")
+    h = (T - t0) / N
+    beta, beta_c = _ADAMS_BASHFORTH[order], _ADAMS_MOULTON[order]
+    history = []  # rhs values, newest first
+
+    def advance(i, state):
+        y, = state
+        t = t0 + i * h
+        history.insert(0, np.asarray(rhs(t, y), dtype=float))
+        del history[order:]
+        if len(history) < order:
+            return _rk4_step(rhs, t, y, h, history[0]),
+        y_new = y + h * _combine(beta, history)
+        if corrector:
+            f_new = np.asarray(rhs(t + h, y_new), dtype=float)
+            y_new = y + h * _combine(beta_c, [f_new] + history[:order - 1])
+        return y_new,
+
+    return _stream(advance, (np.array(y0, dtype=float),), t0, T, N, block_size)
+
+
+def bdf_blocks(rhs: Callable[[float, np.ndarray], np.ndarray], y0: float | np.ndarray, t0: float, T: float, N: int,
+               order: int = 2, jac: Callable | None = None, tol: float = 1e-10, maxiter: int = 10, max_rate: float = 0.5,
+               block_size: int = 4096) -> Iterator[tuple[np.ndarray, np.ndarray]]:
+    """
+        This method shall implement the BDF method of the given order for stiff problems.
+        The implicit equations are solved with the simplified Newton iteration of
+        implicit_euler_newton, reusing the factorization of I - beta h J across steps.
+        The first order-1 steps are done with extrapolated implicit Euler steps of order order-1.
+        The solution is streamed as blocks (t, y) of at most block_size steps.
+    Input:
+        rhs : Callable        -> Right-hand side of the ODE y'(t) = rhs(t, y)
+        y0 : float/np.ndarray -> Initial value y(t0)
+        t0 : float            -> Initial moment in time
+        T : float             -> Final moment in time
+        N : int               -> Number of time steps
+        order : int           -> Order of the method (1 to 4)
+        jac : Callable        -> Jacobian jac(t, y) of rhs, dense or sparse (optional)
+        tol : float           -> Tolerance for the Newton correction
+        maxiter : int         -> Maximum Newton iterations per attempt
+        max_rate : float      -> Contraction rate above which the iteration matrix is renewed
+        block_size : int      -> Number of time steps per block
+    Output:
+        blocks : Iterator     -> Blocks (t, y) of moments in time and solution values
+    """
+    if order not in _BDF:
+        raise ValueError(f"order must be one of {list(_BDF)}.")
+    h = (T - t0) / N
+    newton = _SimplifiedNewton(rhs, jac, np.shape(y0), tol, maxiter, max_rate)
+    history = []  # past states, newest first
+
+    def advance(i, state):
+        y, = state
+        t = t0 + i * h
+        history.insert(0, np.asarray(y, dtype=float).ravel())
+        del history[order:]
+        if len(history) < order:
+            # start with implicit Euler extrapolated from 1, 2, ..., order-1 substeps: every entry of
+            # the table damps infinitely stiff components completely (R(inf) = 0), the order 2
+            # value is A-stable and the order 3 value A(alpha)-stable with alpha close to 90 degrees
+            table = []
+            for m in range(1, order):
+                z = history[0]
+                for k in range(m):
+                    z, _, _ = newton.solve(t + (k + 1) * h / m, h / m, z, z)
+                row = [z]
+                for j in range(1, m):
+                    row.append(row[j - 1] + (row[j - 1] - table[-1][j - 1]) / (m / (m - j) - 1))
+                table.append(row)
+            return table[-1][-1].reshape(np.shape(y0)),
+        alpha, beta = _BDF[order]
+        y_new, _, _ = newton.solve(t + h, beta * h, _combine(alpha, history), history[0])
+        return y_new.reshape(np.shape(y0)),
+
+    return _stream(advance, (np.array(y0, dtype=float),), t0, T, N, block_size)
+
+
+def velocity_verlet_blocks(accel: Callable[[float, np.ndarray], np.ndarray], q0: np.ndarray, v0: np.ndarray, t0: float,
+                           T: float, N: int, block_size: int = 4096) -> Iterator[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+    """
+        This method shall implement the velocity Verlet (leapfrog) method for q'' = accel(t, q).
+        It is symplectic and time reversible, so the energy of Hamiltonian systems does not
+        drift over long horizons. The acceleration of the last step is reused, so a step costs
+        one evaluation. The solution is streamed as blocks (t, q, v) of at most block_size steps.
+    Input:
+        accel : Callable      -> Acceleration q''(t) = accel(t, q)
+        q0 : np.ndarray       -> Initial position q(t0)
+        v0 : np.ndarray       -> Initial velocity q'(t0)
+        t0 : float            -> Initial moment in time
+        T : float             -> Final moment in time
+        N : int               -> Number of time steps
+        block_size : int      -> Number of time steps per block
+    Output:
+        blocks : Iterator     -> Blocks (t, q, v) of moments in time, positions and velocities
+    """
+    h = (T - t0) / N
+    a = [np.asarray(accel(t0, np.asarray(q0, dtype=float)), dtype=float)]
+
+    def advance(i, state):
+        q, v = state
+        v_half = v + h / 2 * a[0]
+        q_new = q + h * v_half
+        a[0] = np.asarray(accel(t0 + (i + 1) * h, q_new), dtype=float)
+        return q_new, v_half + h / 2 * a[0]
+
+    return _stream(advance, (np.array(q0, dtype=float), np.array(v0, dtype=float)), t0, T, N, block_size)
+
+
+def write_blocks(blocks: Iterator[tuple[np.ndarray, ...]], *outs: np.ndarray) -> int:
+    """
+        This method shall write streamed blocks row by row into the output arrays, one per block
+        entry, e.g. np.memmap or np.lib.format.open_memmap files for trajectories larger than
+        the memory. Memory mapped outputs are flushed after every block.
+    Input:
+        blocks : Iterator -> Blocks as yielded by adams_blocks, bdf_blocks or velocity_verlet_blocks
+        outs : np.ndarray -> Output arrays with enough rows, e.g. (t_out, y_out)
+    Output:
+        n : int           -> Number of rows written
+    """
+    n = 0
+    for block in blocks:
+        if len(block) != len(outs):
+            raise ValueError(f"Blocks have {len(block)} entries, but {len(outs)} outputs were given.")
+        rows = len(block[0])
+        for out, values in zip(outs, block):
+            out[n:n + rows] = values
+            if isinstance(out, np.memmap):
+                out.flush()
+        n += rows
+    return n
+
@@ -1,6 +1,12 @@
+import os
+import tempfile
 import unittest
 import numpy as np
+import scipy.sparse
 from ode import forward_difference_quotient, backward_difference_quotient, central_difference_quotient, explicit_euler, implicit_euler
+from ode import implicit_euler_newton, embedded_runge_kutta
+from ode import adams_blocks, bdf_blocks, velocity_verlet_blocks, write_blocks
+from ode import stencil_weights, stencil_derivative, richardson_derivative, complex_step_derivative
 
 
 class TestODE(unittest.TestCase):
@@ -11,6 +17,131 @@ class TestODE(unittest.TestCase):
             with self.assertRaises(ValueError):
                 forward_difference_quotient(np.sin, 0, 0)
 
+    def test_derivative_engine(self):
+        self.assertTrue(np.allclose(stencil_weights((-1, 0, 1), 2), [1, -2, 1]))
+        self.assertTrue(np.allclose(stencil_weights((0, 1), 1), [-1, 1]))
+        x = np.linspace(0, 3, 7)
+        calls = []
+        f = lambda z: calls.append(z.shape) or np.sin(z)
+        df = stencil_derivative(f, x, 1e-2, accuracy=4)
+        self.assertEqual(calls, [(7, 5)])  # one call for all points and stencil offsets
+        self.assertTrue(np.allclose(df, np.cos(x), atol=1e-9))
+        self.assertTrue(np.allclose(stencil_derivative(np.sin, x, 1e-2, derivative=2, accuracy=4), -np.sin(x), atol=1e-8))
+        df, err = richardson_derivative(np.exp, x, 0.5, 5)
+        self.assertTrue(np.allclose(df, np.exp(x), rtol=1e-12))
+        self.assertTrue(np.all(err < 1e-10))
+        self.assertTrue(np.allclose(complex_step_derivative(np.exp, x), np.exp(x), rtol=1e-15))
+
+    def test_explicit_euler_batch(self):
+        A = np.array([[0.0, 1.0], [-1.0, 0.0]])
+        y0 = np.random.default_rng(0).random((50, 2))
+        t, y = explicit_euler(lambda t, y: y @ A.T, y0, 0, 1, 100)
+        self.assertEqual(y.shape, (101, 50, 2))
+        # every member of the ensemble matches the scalar-by-scalar integration
+        for i in [0, 49]:
+            _, yi = explicit_euler(lambda t, y: A @ y, y0[i], 0, 1, 100)
+            self.assertTrue(np.allclose(yi, y[:, i]))
+        t_sparse, y_sparse = explicit_euler(lambda t, y: y @ A.T, y0, 0, 1, 100, save_every=30)
+        self.assertTrue(np.allclose(t_sparse, [0, 0.3, 0.6, 0.9, 1]))
+        self.assertTrue(np.allclose(y_sparse, y[[0, 30, 60, 90, 100]]))
+        t_final, y_final = explicit_euler(lambda t, y: y @ A.T, y0, 0, 1, 100, save_every=None)
+        self.assertEqual(y_final.shape, (1, 50, 2))
+        self.assertTrue(np.allclose(y_final[0], y[-1]))
+        self.assertTrue(np.array_equal(t_final, [1.0]))
+        self.assertTrue(np.array_equal(t, np.linspace(0, 1, 101)))
+        _, y_scalar = explicit_euler(lambda t, y: -y, 1.0, 0, 1, 10)
+        self.assertAlmostEqual(y_scalar[-1], 0.9**10)
+
+    def test_implicit_euler_newton(self):
+        rhs = lambda t, y: -50 * (y - np.cos(t))
+        t, y, stats = implicit_euler_newton(rhs, 0.0, 0, 2, 100)
+        self.assertTrue(np.allclose(y, implicit_euler(rhs, 0.0, 0, 2, 100)[1]))
+        # the problem is linear, so one factorization serves all steps
+        self.assertEqual(stats["factorizations"].sum(), 1)
+        self.assertTrue(np.all(stats["newton_iterations"] >= 1))
+        # heat equation with a sparse Jacobian
+        n = 500
+        x = np.linspace(0, 1, n + 2)[1:-1]
+        L = scipy.sparse.diags([1.0, -2.0, 1.0], [-1, 0, 1], shape=(n, n), format="csr") * (n + 1)**2
+        t, u, stats = implicit_euler_newton(lambda t, u: L @ u, np.sin(np.pi * x), 0, 0.1, 200, jac=lambda t, u: L)
+        self.assertEqual(u.shape, (201, n))
+        self.assertEqual(stats["factorizations"].sum(), 1)
+        self.assertLess(abs(u[-1].max() - np.exp(-np.pi**2 * 0.1)), 1e-2)
+        # nonlinear system with an analytic and with a finite-difference Jacobian
+        f = lambda t, y: np.array([y[1], 10 * (1 - y[0]**2) * y[1] - y[0]])
+        J = lambda t, y: np.array([[0, 1], [-20 * y[0] * y[1] - 1, 10 * (1 - y[0]**2)]])
+        _, y_jac, _ = implicit_euler_newton(f, np.array([2.0, 0.0]), 0, 5, 500, jac=J)
+        _, y_fd, _ = implicit_euler_newton(f, np.array([2.0, 0.0]), 0, 5, 500)
+        self.assertTrue(np.allclose(y_jac, y_fd, atol=1e-6))
+        # ensemble state (batch, dim) with the finite-difference Jacobian
+        rotation = lambda t, y: np.stack([y[:, 1], -y[:, 0]], axis=1)
+        y0 = np.array([[1.0, 0.0], [0.0, 1.0], [2.0, 1.0]])
+        _, y_batch, _ = implicit_euler_newton(rotation, y0, 0, 1, 10)
+        self.assertEqual(y_batch.shape, (11, 3, 2))
+        for i in range(3):
+            _, yi, _ = implicit_euler_newton(lambda t, y: np.array([y[1], -y[0]]), y0[i], 0, 1, 10)
+            self.assertTrue(np.allclose(y_batch[:, i], yi))
+        # stiff scalar cubic where the first steps need several renewals of the matrix
+        cubic = lambda t, y: -1e4 * y**3
+        _, y_cubic, _ = implicit_euler_newton(cubic, 1.0, 0, 1, 10)
+        self.assertTrue(np.allclose(y_cubic, implicit_euler(cubic, 1.0, 0, 1, 10)[1]))
+
+    def test_embedded_runge_kutta(self):
+        f = lambda t, y: np.array([y[1], -y[0]])
+        for method in ["RK23", "RK45"]:
+            with self.subTest(method):
+                t, y = embedded_runge_kutta(f, np.array([1.0, 0.0]), 0, 10, method, rtol=1e-8, atol=1e-10)
+                self.assertEqual(t[-1], 10)
+                self.assertLess(np.max(np.abs(y[:, 0] - np.cos(t))), 1e-6)
+                # dense output at many times does not change the steps
+                t_eval = np.linspace(0, 10, 1001)
+                t_dense, y_dense = embedded_runge_kutta(f, np.array([1.0, 0.0]), 0, 10, method, rtol=1e-8,
+                                                        atol=1e-10, t_eval=t_eval)
+                self.assertTrue(np.array_equal(t_dense, t_eval))
+                self.assertTrue(np.allclose(y_dense[-1], y[-1]))
+                self.assertLess(np.max(np.abs(y_dense[:, 0] - np.cos(t_eval))), 1e-6)
+        t, y = embedded_runge_kutta(lambda t, y: -y, 1.0, 0, 1, t_eval=[0, 0.5, 1])
+        self.assertTrue(np.allclose(y, np.exp(-t), rtol=1e-5))
+        # a run that needs exactly max_steps steps succeeds
+        decay = lambda t, y: -y
+        t, _ = embedded_runge_kutta(decay, 1.0, 0, 0.5, h0=0.25, rtol=0.1, atol=0.1, max_steps=2)
+        self.assertTrue(np.array_equal(t, [0, 0.25, 0.5]))
+        self.assertRaises(RuntimeError, embedded_runge_kutta, decay, 1.0, 0, 0.5, h0=0.25, rtol=0.1, atol=0.1, max_steps=1)
+        with self.assertRaises(ValueError):
+            embedded_runge_kutta(f, np.array([1.0, 0.0]), 0, 1, "RK78")
+
+    def test_streaming_integrators(self):
+        f = lambda t, y: -y + np.sin(t)
+        exact = 1.5 * np.exp(-5) + 0.5 * (np.sin(5) - np.cos(5))
+        for name, method in [("AB", lambda N: adams_blocks(f, 1.0, 0, 5, N, 4, block_size=37)),
+                             ("ABM", lambda N: adams_blocks(f, 1.0, 0, 5, N, 4, corrector=True)),
+                             ("BDF", lambda N: bdf_blocks(f, 1.0, 0, 5, N, 4))]:
+            with self.subTest(name):
+                errors = []
+                for N in [200, 400]:
+                    t, y = [np.concatenate(x) for x in zip(*method(N))]
+                    self.assertEqual(len(t), N + 1)
+                    self.assertEqual(t[-1], 5)
+                    errors.append(abs(y[-1] - exact))
+                self.assertGreater(np.log2(errors[0] / errors[1]), 3.8)  # fourth order
+        # the startup steps of BDF must damp the stiff transient instead of overshooting
+        stiff = lambda t, y: -1e6 * (y - np.cos(t))
+        for order in [2, 3, 4]:
+            t, y = [np.concatenate(x) for x in zip(*bdf_blocks(stiff, 0.0, 0, 1, 20, order))]
+            self.assertLess(np.max(np.abs(y[1:] - np.cos(t[1:]))), 1e-4)
+        # the energy of the harmonic oscillator does not drift
+        energy = [0.5 * (q**2 + v**2) for _, q, v in velocity_verlet_blocks(lambda t, q: -q, np.array([1.0]),
+                                                                             np.array([0.0]), 0, 1000, 10**5, 10**4)]
+        self.assertLess(np.ptp(np.concatenate(energy)), 1e-4)
+        A = np.array([[0.0, 1.0], [-1.0, 0.0]])
+        with tempfile.TemporaryDirectory() as directory:
+            t_out = np.lib.format.open_memmap(os.path.join(directory, "t.npy"), mode="w+", shape=(1001,))
+            y_out = np.lib.format.open_memmap(os.path.join(directory, "y.npy"), mode="w+", shape=(1001, 2))
+            self.assertEqual(write_blocks(adams_blocks(lambda t, y: A @ y, np.array([1.0, 0.0]), 0, 10, 1000,
+                                                       block_size=64), t_out, y_out), 1001)
+            self.assertTrue(np.allclose(y_out[-1], [np.cos(10), -np.sin(10)], atol=1e-6))
+            del t_out, y_out
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -5,7 +5,10 @@ if version_info[0] < 3 or version_info[1] < 10:
 ###########################################################
 
 import numpy as np
+import scipy.sparse
+import scipy.sparse.linalg
 import warnings
+from scipy.linalg import lapack, solve_banded, solveh_banded, solve_triangular
 
 def check_input(A: np.ndarray[float], b: np.ndarray[float]) -> None:
     """
@@ -25,61 +28,479 @@ def check_input(A: np.ndarray[float], b: np.ndarray[float]) -> None:
         raise ValueError("Vector b must have same length as the number of rows in A.")
 
     # Check: strict diagonal dominance
-    n = A.shape[0]
-    for i in range(n):
-        diagonal = abs(A[i, i])
-        off_diagonal_sum = np.sum(np.abs(A[i, :])) - diagonal
-        if diagonal <= off_diagonal_sum:
-            warnings.warn(f"Matrix A is not strictly diagonally dominant at row {i}.", UserWarning)
-            break  # One warning is enough
+    rows = _non_dominant_rows(A)
+    if len(rows):
+        warnings.warn(f"Matrix A is not strictly diagonally dominant at row {rows[0]}.", UserWarning)
 
 
-def gauss(A: np.ndarray[float], b: np.ndarray[float], tol: float = 1e-12) -> np.ndarray[float]:
+def _non_dominant_rows(A) -> np.ndarray[int]:
+    """
+        Returns the rows i with |A[i,i]| <= sum_{j != i} |A[i,j]| of a dense or sparse matrix,
+        computed with one pass over the absolute values instead of a loop over the rows.
     """
-        This method shall solve the linear system Ax = b using the Gauß algorithm without pivot search
+    absA = abs(A) if scipy.sparse.issparse(A) else np.abs(A)
+    diagonal = np.abs(A.diagonal())
+    off_diagonal_sum = np.asarray(absA.sum(axis=1)).ravel() - diagonal
+    return np.flatnonzero(diagonal <= off_diagonal_sum)
+
+
+def lu_decomposition(A: np.ndarray[float], tol: float = 1e-12, overwrite: bool = False,
+                     block_size: int = 256) -> np.ndarray[float]:
+    """
+        This method shall compute the LU decomposition A = LU without pivot search.
+        The matrix is processed in blocks of block_size: the diagonal block is eliminated with
+        rank-1 updates, the blocks of L and U next to it with triangular solves, and the
+        trailing submatrix with one rank-block_size matrix product, so most of the flops
+        run through BLAS-3. L (unit diagonal, not stored) and U are returned in one matrix.
+    Input:
+        A: np.ndarray     -> Square system matrix
+        tol: float        -> Pivots with absolute value below tol are rejected (optional argument)
+        overwrite: bool   -> Factorize A in place if it is a float array (optional argument)
+        block_size: int   -> Number of columns per panel (optional argument)
+    Output:
+        LU: np.ndarray    -> Strict lower part of L and upper part of U
+    """
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Matrix A must be square.")
+    if block_size < 1:
+        raise ValueError("block_size must be positive.")
+    if overwrite and A.dtype == np.float64:
+        LU = A
+    else:
+        LU = np.array(A, dtype=float)
+    n = LU.shape[0]
+
+    for k in range(0, n, block_size):
+        e = min(k + block_size, n)
+        # factorize the diagonal block with rank-1 updates
+        for i in range(k, e):
+            if abs(LU[i, i]) <= tol:
+                raise ValueError(f"Pivot too small at row {i}: |A[{i},{i}]| <= {tol}")
+            LU[i + 1:e, i] /= LU[i, i]
+            LU[i + 1:e, i + 1:e] -= np.outer(LU[i + 1:e, i], LU[i, i + 1:e])
+        if e < n:
+            # without pivoting the off-diagonal blocks follow from triangular solves,
+            # L21 = A21 U11^-1 and U12 = L11^-1 A12, then the trailing submatrix gets one rank-(e-k) update
+            LU[e:, k:e] = solve_triangular(LU[k:e, k:e], LU[e:, k:e].T, trans='T', check_finite=False).T
+            LU[k:e, e:] = solve_triangular(LU[k:e, k:e], LU[k:e, e:], lower=True, unit_diagonal=True,
+                                           check_finite=False)
+            LU[e:, e:] -= LU[e:, k:e] @ LU[k:e, e:]
+
+    return LU
+
+
+PIVOTING = ("none", "partial", "rook", "complete")
+
+
+def _panel_lu(P: np.ndarray[float], tol: float, offset: int) -> np.ndarray[int]:
+    """
+        Factorizes the tall panel P (m x w, m >= w) in place with partial pivoting by recursive
+        halving, so the work on the panel is mostly triangular solves and matrix products.
+        The rows of the panel (a gathered copy, not the matrix itself) are swapped physically;
+        the returned permutation maps the rows of the factorized panel to the rows of the original one.
+    """
+    m, w = P.shape
+    if w == 1:
+        i = int(np.argmax(np.abs(P[:, 0])))
+        if abs(P[i, 0]) <= tol:
+            raise ValueError(f"Pivot too small at row {offset}: |A[{offset},{offset}]| <= {tol}")
+        perm = np.arange(m)
+        perm[[0, i]] = perm[[i, 0]]
+        P[[0, i]] = P[[i, 0]]
+        P[1:, 0] /= P[0, 0]
+        return perm
+
+    w1 = w // 2
+    perm = _panel_lu(P[:, :w1], tol, offset)
+    P[:, w1:] = P[perm, w1:]
+    P[:w1, w1:] = solve_triangular(P[:w1, :w1], P[:w1, w1:], lower=True, unit_diagonal=True, check_finite=False)
+    P[w1:, w1:] -= P[w1:, :w1] @ P[:w1, w1:]
+    perm2 = _panel_lu(P[w1:, w1:], tol, offset + w1)
+    P[w1:, :w1] = P[w1:, :w1][perm2]
+    perm[w1:] = perm[w1:][perm2]
+    return perm
+
+
+def _lu_partial(LU: np.ndarray[float], tol: float, block_size: int) -> np.ndarray[int]:
+    """
+        Blocked LU decomposition with partial pivoting of LU in place. During the elimination
+        rows are not swapped in LU, the pivot order is kept in the returned index array piv,
+        i.e. afterwards LU[piv] holds L\\U. Only the current panel is gathered into a contiguous copy.
+    """
+    n = LU.shape[0]
+    piv = np.arange(n)
+    for k in range(0, n, block_size):
+        e = min(k + block_size, n)
+        P = LU[piv[k:], k:e]
+        piv[k:] = piv[k:][_panel_lu(P, tol, k)]
+        LU[piv[k:], k:e] = P
+        if e < n:
+            top, rest = piv[k:e], piv[e:]
+            U12 = solve_triangular(P[:e - k], LU[top, e:], lower=True, unit_diagonal=True, check_finite=False)
+            LU[top, e:] = U12
+            LU[rest, e:] -= P[e - k:] @ U12
+    return piv
+
+
+def _lu_search(LU: np.ndarray[float], tol: float, pivoting: str) -> tuple[np.ndarray[int], np.ndarray[int]]:
+    """
+        LU decomposition of LU in place with rook or complete pivoting. Both need the whole
+        trailing submatrix up to date, so it is eliminated with one rank-1 update per pivot.
+        During the elimination rows and columns are not moved; afterwards LU[np.ix_(piv, cpiv)] holds L\\U.
+    """
+    n = LU.shape[0]
+    piv, cpiv = np.arange(n), np.arange(n)
+    for k in range(n):
+        rows, cols = piv[k:], cpiv[k:]
+        if pivoting == "complete":
+            i, j = np.unravel_index(np.argmax(np.abs(LU[np.ix_(rows, cols)])), (n - k, n - k))
+        else:
+            # rook: alternate column and row maxima until the entry is maximal in both
+            j = 0
+            i = int(np.argmax(np.abs(LU[rows, cols[j]])))
+            while True:
+                j_new = int(np.argmax(np.abs(LU[rows[i], cols])))
+                if abs(LU[rows[i], cols[j_new]]) <= abs(LU[rows[i], cols[j]]):
+                    break
+                j = j_new
+                i_new = int(np.argmax(np.abs(LU[rows, cols[j]])))
+                if abs(LU[rows[i_new], cols[j]]) <= abs(LU[rows[i], cols[j]]):
+                    break
+                i = i_new
+        piv[[k, k + i]] = piv[[k + i, k]]
+        cpiv[[k, k + j]] = cpiv[[k + j, k]]
+        p, q = piv[k], cpiv[k]
+        if abs(LU[p, q]) <= tol:
+            raise ValueError(f"Pivot too small at row {k}: |A[{k},{k}]| <= {tol}")
+        rows, cols = piv[k + 1:], cpiv[k + 1:]
+        LU[rows, q] /= LU[p, q]
+        LU[np.ix_(rows, cols)] -= np.outer(LU[rows, q], LU[p, cols])
+    return piv, cpiv
+
+
+def _permute_inplace(M: np.ndarray[float], perm: np.ndarray[int]) -> None:
+    """
+        Overwrites M with M[perm] following the cycles of perm, so only one row is buffered.
+    """
+    done = perm == np.arange(len(perm))
+    for start in np.flatnonzero(~done):
+        if done[start]:
+            continue
+        buffer = M[start].copy()
+        i = start
+        while perm[i] != start:
+            M[i] = M[perm[i]]
+            done[i] = True
+            i = perm[i]
+        M[i] = buffer
+        done[i] = True
+
+
+def pivoted_lu_decomposition(A: np.ndarray[float], pivoting: str = "partial", tol: float = 1e-12,
+                             overwrite: bool = False, block_size: int = 256) -> tuple[np.ndarray[float], np.ndarray[int], np.ndarray[int]]:
+    """
+        This method shall compute the LU decomposition A[piv][:, cpiv] = LU with pivot search.
+        During the elimination row and column swaps are recorded in the index arrays piv and
+        cpiv only; the factors are brought into pivot order once at the end, in place by
+        following the cycles of the permutations, so with overwrite the result is stored in A.
+        Partial pivoting is blocked like lu_decomposition, rook and complete pivoting search
+        the whole trailing submatrix and eliminate one pivot at a time.
+    Input:
+        A: np.ndarray     -> Square system matrix
+        pivoting: str     -> 'none', 'partial', 'rook' or 'complete' (optional argument)
+        tol: float        -> Pivots with absolute value below tol are rejected (optional argument)
+        overwrite: bool   -> Use A as workspace if it is a float array (optional argument)
+        block_size: int   -> Number of columns per panel of partial pivoting (optional argument)
+    Output:
+        LU: np.ndarray    -> Strict lower part of L and upper part of U
+        piv: np.ndarray   -> Row permutation
+        cpiv: np.ndarray  -> Column permutation
+    """
+    if pivoting not in PIVOTING:
+        raise ValueError(f"Unknown pivoting '{pivoting}'. Use one of {PIVOTING}.")
+    if pivoting == "none":
+        LU = lu_decomposition(A, tol, overwrite, block_size)
+        return LU, np.arange(LU.shape[0]), np.arange(LU.shape[0])
+    if A.ndim != 2 or A.shape[0] != A.shape[1]:
+        raise ValueError("Matrix A must be square.")
+    if block_size < 1:
+        raise ValueError("block_size must be positive.")
+    LU = A if overwrite and A.dtype == np.float64 else np.array(A, dtype=float)
+
+    if pivoting == "partial":
+        piv, cpiv = _lu_partial(LU, tol, block_size), np.arange(LU.shape[0])
+    else:
+        piv, cpiv = _lu_search(LU, tol, pivoting)
+    _permute_inplace(LU, piv)
+    _permute_inplace(LU.T, cpiv)
+    return LU, piv, cpiv
+
+
+class LUFactorization:
+    """
+        This class shall store the LU decomposition of A once, so that any number of right-hand
+        sides can be solved in O(n^2) each. The packed factors L\\U are kept in 'lu', the row
+        and column permutations as index arrays in 'piv' and 'cpiv'. It reports the growth
+        factor max|U| / max|A| and estimates the condition number in the 1-norm from a few
+        solves, without forming the inverse.
+    Input:
+        A: np.ndarray     -> Square system matrix
+        tol: float        -> Pivots with absolute value below tol are rejected (optional argument)
+        overwrite: bool   -> Use A as workspace if it is a float array (optional argument)
+        block_size: int   -> Number of columns per block of the decomposition (optional argument)
+        pivoting: str     -> 'none', 'partial', 'rook' or 'complete' (optional argument)
+    """
+    def __init__(self, A: np.ndarray[float], tol: float = 1e-12, overwrite: bool = False, block_size: int = 256,
+                 pivoting: str = "partial"):
+        A_max = np.max(np.abs(A)) if A.size else 0.0
+        self.norm = np.max(np.sum(np.abs(A), axis=0)) if A.size else 0.0
+        self.pivoting = pivoting
+        self.lu, self.piv, self.cpiv = pivoted_lu_decomposition(A, pivoting, tol, overwrite, block_size)
+        self.n = self.lu.shape[0]
+        self.growth_factor = np.max(np.abs(np.triu(self.lu))) / A_max if A_max > 0 else 1.0
+
+    def solve(self, b: np.ndarray[float], trans: bool = False) -> np.ndarray[float]:
+        """
+            This method shall solve Ax = b (or A^T x = b) for a right-hand side vector (n,) or a
+            block of right-hand sides (n, k) with one forward and one backward substitution.
+        Input:
+            b: np.ndarray -> Right-hand side vector or matrix
+            trans: bool   -> Solve with the transposed matrix (optional argument)
+        Output:
+            x: np.ndarray -> Solution with the shape of b
+        """
+        b = np.asarray(b, dtype=float)
+        if b.shape[0] != self.n:
+            raise ValueError("Vector b must have same length as the number of rows in A.")
+        x = np.empty_like(b)
+        if trans:
+            # A^T[cpiv][:, piv] = U^T L^T
+            y = solve_triangular(self.lu, b[self.cpiv], trans='T', check_finite=False)
+            x[self.piv] = solve_triangular(self.lu, y, trans='T', lower=True, unit_diagonal=True,
+                                           check_finite=False, overwrite_b=True)
+        else:
+            y = solve_triangular(self.lu, b[self.piv], lower=True, unit_diagonal=True, check_finite=False)
+            x[self.cpiv] = solve_triangular(self.lu, y, check_finite=False, overwrite_b=True)
+        return x
+
+    def condition_estimate(self, maxiter: int = 5) -> float:
+        """
+            This method shall estimate the condition number ||A||_1 ||A^-1||_1 with Hager's
+            method (as refined by Higham), which needs a few solves with A and A^T instead of A^-1.
+        Input:
+            maxiter: int -> Maximum number of iterations (optional argument)
+        Output:
+            float -> Estimate (a lower bound, usually within a factor of 3) of the condition number
+        """
+        n = self.n
+        if n == 0:
+            return 0.0
+        x = np.full(n, 1 / n)
+        estimate = 0.0
+        for k in range(maxiter):
+            y = self.solve(x)
+            estimate = np.sum(np.abs(y))
+            z = self.solve(np.where(y >= 0, 1.0, -1.0), trans=True)
+            j = int(np.argmax(np.abs(z)))
+            if k > 0 and abs(z[j]) <= z @ x:
+                break
+            x = np.zeros(n)
+            x[j] = 1.0
+        # alternating test vector that catches the cases the iteration misses
+        alt = (-1.0)**np.arange(n) * (1 + np.arange(n) / max(n - 1, 1))
+        estimate = max(estimate, 2 * np.sum(np.abs(self.solve(alt))) / (3 * n))
+        return float(self.norm * estimate)
+
+
+def gauss(A: np.ndarray[float], b: np.ndarray[float], tol: float = 1e-12, pivoting: str = "none") -> np.ndarray[float]:
+    """
+        This method shall solve the linear system Ax = b using the Gauß algorithm, by default without pivot search
     Input:
         A: np.ndarray -> System matrix
         b: np.ndarray -> Right-hand side vector
         c: float      -> Tolerance for the stop criterion (optional argument)
+        pivoting: str -> 'none', 'partial', 'rook' or 'complete' (optional argument)
     Output:
         x: np.ndarray -> Solution vector of the system
     """
     check_input(A, b)
+    return LUFactorization(A, tol, pivoting=pivoting).solve(b)
 
-    A = A.copy().astype(float)
-    b = b.copy().astype(float)
-    n = A.shape[0]
 
-    # Forward elimination
-    for i in range(n):
-        if abs(A[i, i]) <= tol:
-            raise ValueError(f"Pivot too small at row {i}: |A[{i},{i}]| <= {tol}")
-        
-        for j in range(i + 1, n):
-            factor = A[j, i] / A[i, i]
-            A[j, i:] = A[j, i:] - factor * A[i, i:]
-            b[j] = b[j] - factor * b[i]
+def frobenius_norm(A: np.ndarray[float]) -> float:
+    """
+        This method shall compute the Frobenius norm of the matrix A
+    Input:
+        A: np.ndarray -> System matrix whose Frobenius norm shall be calculated
+    Output:
+        float -> Frobenius norm ||A||_F of A
+    """
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("Matrix A must be square to compute the Frobenius norm.")
 
-    # Backward substitution
-    x = np.zeros(n)
+    return np.sqrt(np.sum(A ** 2))
 
-    for i in reversed(range(n)):
-        if abs(A[i, i]) <= tol:
-            raise ValueError(f"Zero pivot encountered at row {i} during back substitution.")
-        x[i] = (b[i] - np.dot(A[i, i + 1:], x[i + 1:])) / A[i, i]
 
+def band_storage(A, lower: int, upper: int) -> np.ndarray[float]:
+    """
+        This method shall store the band of A in the compact LAPACK format, i.e. the
+        (lower + upper + 1, n) matrix ab with ab[upper + i - j, j] = A[i, j].
+    Input:
+        A: np.ndarray   -> Square dense or sparse matrix
+        lower: int      -> Number of subdiagonals
+        upper: int      -> Number of superdiagonals
+    Output:
+        ab: np.ndarray  -> Band storage of A
+    """
+    n = A.shape[0]
+    ab = np.zeros((lower + upper + 1, n))
+    for k in range(-lower, upper + 1):
+        # the k-th diagonal A[i, i + k] is stored in row upper - k, columns max(k, 0) ...
+        d = A.diagonal(k)
+        ab[upper - k, max(k, 0):max(k, 0) + len(d)] = d
+    return ab
+
+
+def tridiagonal_solve(lower: np.ndarray[float], diagonal: np.ndarray[float], upper: np.ndarray[float],
+                      b: np.ndarray[float]) -> np.ndarray[float]:
+    """
+        This method shall solve a tridiagonal system given by its three diagonals in O(n).
+        It uses the LAPACK routine gtsv, the Thomas algorithm with partial pivoting, so it is
+        stable also without diagonal dominance.
+    Input:
+        lower: np.ndarray    -> Subdiagonal (n-1)
+        diagonal: np.ndarray -> Diagonal (n)
+        upper: np.ndarray    -> Superdiagonal (n-1)
+        b: np.ndarray        -> Right-hand side vector (n) or matrix (n, k)
+    Output:
+        x: np.ndarray        -> Solution with the shape of b
+    """
+    n = len(diagonal)
+    if len(lower) != n - 1 or len(upper) != n - 1 or b.shape[0] != n:
+        raise ValueError("The diagonals and b must have the lengths n-1, n, n-1 and n.")
+    _, _, _, x, info = lapack.dgtsv(np.asarray(lower, dtype=float), np.asarray(diagonal, dtype=float),
+                                    np.asarray(upper, dtype=float), np.asarray(b, dtype=float))
+    if info > 0:
+        raise ValueError(f"Tridiagonal matrix is singular: zero pivot at row {info - 1}.")
     return x
 
 
-def frobenius_norm(A: np.ndarray[float]) -> float:
+def banded_solve(ab: np.ndarray[float], lower: int, upper: int, b: np.ndarray[float],
+                 symmetric_positive: bool = False) -> np.ndarray[float]:
     """
-        This method shall compute the Frobenius norm of the matrix A
+        This method shall solve a banded system in band storage (see band_storage) with an
+        O(n (lower + upper)^2) banded LU with partial pivoting, or with a banded Cholesky
+        decomposition if the matrix is symmetric positive definite.
     Input:
-        A: np.ndarray -> System matrix whose Frobenius norm shall be calculated
+        ab: np.ndarray            -> Band storage of the system matrix
+        lower: int                -> Number of subdiagonals
+        upper: int                -> Number of superdiagonals
+        b: np.ndarray             -> Right-hand side vector (n) or matrix (n, k)
+        symmetric_positive: bool  -> Use the Cholesky decomposition (optional argument)
     Output:
-        float -> Frobenius norm ||A||_F of A
+        x: np.ndarray             -> Solution with the shape of b
+    """
+    try:
+        if symmetric_positive:
+            # solveh_banded expects the upper band only
+            return solveh_banded(ab[:upper + 1], b, check_finite=False)
+        return solve_banded((lower, upper), ab, b, check_finite=False)
+    except np.linalg.LinAlgError as e:
+        raise ValueError(f"Banded matrix is singular or not positive definite: {e}")
+
+
+def _bandwidth(A, tol: float = 0.0) -> tuple[int, int]:
+    """
+        Returns the number of sub- and superdiagonals of a dense or sparse matrix. For CSR
+        matrices with sorted indices and no stored zeros only the first and last entry of
+        every row are inspected, i.e. O(n) instead of O(nnz).
+    """
+    if scipy.sparse.issparse(A):
+        csr = A.tocsr()
+        if tol == 0 and csr.has_sorted_indices and np.all(csr.data != 0):
+            rows = np.flatnonzero(np.diff(csr.indptr))
+            if len(rows) == 0:
+                return 0, 0
+            first, last = csr.indices[csr.indptr[rows]], csr.indices[csr.indptr[rows + 1] - 1]
+            return int(max(np.max(rows - first), 0)), int(max(np.max(last - rows), 0))
+        coo = csr.tocoo()
+        mask = np.abs(coo.data) > tol
+        rows, cols = coo.row[mask], coo.col[mask]
+    else:
+        rows, cols = np.nonzero(np.abs(A) > tol)
+    offsets = rows.astype(np.int64) - cols
+    return int(max(offsets.max(initial=0), 0)), int(max(-offsets.min(initial=0), 0))
+
+
+def detect_structure(A, tol: float = 0.0) -> dict:
+    """
+        This method shall detect the structure of A that decides on the cheapest solver:
+        the number of sub- and superdiagonals, symmetry, strict diagonal dominance and the
+        sign of the diagonal.
+    Input:
+        A: np.ndarray  -> Square dense or sparse matrix
+        tol: float     -> Entries with absolute value <= tol count as zero (optional argument)
+    Output:
+        structure: dict -> 'lower', 'upper', 'symmetric', 'diagonally_dominant', 'positive_diagonal'
     """
     if A.shape[0] != A.shape[1]:
-        raise ValueError("Matrix A must be square to compute the Frobenius norm.")
+        raise ValueError("Matrix A must be square.")
+    lower, upper = _bandwidth(A, tol)
+    if scipy.sparse.issparse(A):
+        symmetric = abs(A - A.T).max() <= tol if A.shape[0] else True
+    else:
+        symmetric = np.all(np.abs(A - A.T) <= tol)
+    return {
+        "lower": lower,
+        "upper": upper,
+        "symmetric": bool(symmetric),
+        "diagonally_dominant": len(_non_dominant_rows(A)) == 0,
+        "positive_diagonal": bool(np.all(A.diagonal() > 0)),
+    }
+
+
+def solve(A, b: np.ndarray[float], tol: float = 1e-12) -> np.ndarray[float]:
+    """
+        This method shall solve Ax = b with the cheapest solver for the structure of A:
+        a division for diagonal and gtsv for tridiagonal matrices (decided from the bandwidth
+        alone), a banded LU for narrow banded matrices (a banded Cholesky decomposition if A is
+        symmetric, strictly diagonally dominant and has a positive diagonal, i.e. is positive
+        definite), a sparse LU for other sparse matrices and otherwise a dense LU decomposition,
+        without pivot search if A is strictly diagonally dominant.
+    Input:
+        A: np.ndarray -> Square dense or sparse system matrix
+        b: np.ndarray -> Right-hand side vector (n) or matrix (n, k)
+        tol: float    -> Tolerance for the pivots of the dense LU decomposition (optional argument)
+    Output:
+        x: np.ndarray -> Solution with the shape of b
+    """
+    b = np.asarray(b, dtype=float)
+    if A.shape[0] != A.shape[1]:
+        raise ValueError("Matrix A must be square.")
+    if A.shape[0] != b.shape[0]:
+        raise ValueError("Vector b must have same length as the number of rows in A.")
+    n = A.shape[0]
+    lower, upper = _bandwidth(A)
+
+    if lower == upper == 0:
+        diagonal = A.diagonal()
+        if np.any(np.abs(diagonal) <= tol):
+            raise ValueError("Diagonal matrix is singular.")
+        return b / diagonal.reshape((-1,) + (1,) * (b.ndim - 1))
+    if lower <= 1 and upper <= 1:
+        return tridiagonal_solve(A.diagonal(-1), A.diagonal(), A.diagonal(1), b)
 
-    return np.sqrt(np.sum(A ** 2))
\ No newline at end of file
+    sparse = scipy.sparse.issparse(A)
+    # the band storage has (2 lower + upper + 1) n entries (with the fill-in of the pivoting):
+    # for dense matrices it must be smaller than A, for sparse ones comparable to the nonzeros
+    if (sparse and (2 * lower + upper + 1) * n <= 10 * A.nnz) or (not sparse and 2 * (lower + upper + 1) < n):
+        structure = detect_structure(A)
+        spd = structure["symmetric"] and structure["diagonally_dominant"] and structure["positive_diagonal"]
+        return banded_solve(band_storage(A, lower, upper), lower, upper, b, symmetric_positive=spd)
+    if sparse:
+        try:
+            return scipy.sparse.linalg.splu(scipy.sparse.csc_matrix(A)).solve(b)
+        except RuntimeError as e:
+            raise ValueError(f"Sparse matrix is singular: {e}")
+    pivoting = "none" if len(_non_dominant_rows(A)) == 0 else "partial"
+    return LUFactorization(np.asarray(A), tol, pivoting=pivoting).solve(b)
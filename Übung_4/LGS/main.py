@@ -6,7 +6,7 @@ if version_info[0] < 3 or version_info[1] < 10:
 ###########################################################
 import numpy as np
 import matplotlib.pyplot as plt
-from lgs import check_input, gauss, frobenius_norm
+from lgs import check_input, gauss, frobenius_norm, LUFactorization, detect_structure, solve
 
 if __name__ == '__main__':
 # 4.2a
@@ -14,6 +14,7 @@ if __name__ == '__main__':
     b1 = np.array([4, 5, 5, 5, 4], float)
     x1 = gauss(A1, b1)
     print("Solution for 4.2a:", x1)
+    print("Structure of A1:", detect_structure(A1), "-> solution:", solve(A1, b1))
 
     #4.2b
     A2 = np.array([[1, 2, 2],[2, 4, 6],[1,-1, 1]], float)
@@ -23,6 +24,9 @@ if __name__ == '__main__':
         print("Solution for 4.2b:", x2)
     except Exception as e:
         print("Error solving 4.2b:", e)
+        lu2 = LUFactorization(A2, pivoting="partial")
+        print("Solution for 4.2b with partial pivoting:", lu2.solve(b2))
+        print(f"Growth factor: {lu2.growth_factor:.2f}, estimated condition number: {lu2.condition_estimate():.2f}")
 
     #4.2c 
     t_vals      = list(range(10))
@@ -44,8 +48,8 @@ if __name__ == '__main__':
         cond = normA * normInvA
         conds.append(cond)
 
-        x      = gauss(A, b)
-        x_tilde = gauss(A, b + b_perturb)
+        # factorize once (without pivot search, like gauss), solve both right-hand sides in one block
+        x, x_tilde = LUFactorization(A, pivoting="none").solve(np.column_stack([b, b + b_perturb])).T
 
         rel_err = np.linalg.norm(x_tilde - x) / np.linalg.norm(x)
         rel_errors.append(rel_err)
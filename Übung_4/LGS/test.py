@@ -1,7 +1,9 @@
 import unittest
 import warnings
 import numpy as np
-from lgs import check_input, gauss, frobenius_norm
+import scipy.sparse
+from lgs import band_storage, tridiagonal_solve, banded_solve, detect_structure, solve
+from lgs import check_input, gauss, frobenius_norm, lu_decomposition, LUFactorization, pivoted_lu_decomposition
 
 class TestGauss(unittest.TestCase):
     def test_check_input(self):
@@ -15,6 +17,97 @@ class TestGauss(unittest.TestCase):
             with self.assertWarns(Warning):
                 check_input(A, b)
 
+    def test_lu_decomposition(self):
+        rng = np.random.default_rng(0)
+        n = 150
+        A = rng.random((n, n)) + n * np.eye(n)
+        for block_size in [1, 16, 64, 256]:
+            with self.subTest(block_size=block_size):
+                LU = lu_decomposition(A, block_size=block_size)
+                L, U = np.tril(LU, -1) + np.eye(n), np.triu(LU)
+                self.assertTrue(np.allclose(L @ U, A))
+        B = A.copy()
+        self.assertIs(lu_decomposition(B, overwrite=True), B)
+        b = rng.random(n)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            self.assertTrue(np.allclose(A @ gauss(A, b), b))
+            with self.assertRaises(ValueError):
+                gauss(np.array([[1, 2, 2], [2, 4, 6], [1, -1, 1]], float), np.array([2, 5, -3], float))
+
+    def test_LU_factorization(self):
+        rng = np.random.default_rng(1)
+        n = 40
+        A = rng.random((n, n)) + n * np.eye(n)
+        B = rng.random((n, 5))
+        lu = LUFactorization(A)
+        X = lu.solve(B)
+        self.assertEqual(X.shape, (n, 5))
+        self.assertTrue(np.allclose(A @ X, B))
+        self.assertTrue(np.allclose(lu.solve(B[:, 2]), X[:, 2]))
+        with self.assertRaises(ValueError):
+            lu.solve(np.ones(n + 1))
+
+    def test_pivoting(self):
+        A2 = np.array([[1, 2, 2], [2, 4, 6], [1, -1, 1]], float)
+        b2 = np.array([2, 5, -3], float)
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for pivoting in ["partial", "rook", "complete"]:
+                with self.subTest(pivoting=pivoting):
+                    self.assertTrue(np.allclose(gauss(A2, b2, pivoting=pivoting), np.linalg.solve(A2, b2)))
+        rng = np.random.default_rng(2)
+        n = 60
+        A = rng.standard_normal((n, n))
+        for pivoting in ["partial", "rook", "complete"]:
+            with self.subTest(pivoting=pivoting):
+                LU, piv, cpiv = pivoted_lu_decomposition(A, pivoting, block_size=16)
+                L, U = np.tril(LU, -1) + np.eye(n), np.triu(LU)
+                self.assertTrue(np.allclose(L @ U, A[np.ix_(piv, cpiv)]))
+                self.assertLessEqual(np.max(np.abs(np.tril(LU, -1))), 1.0)  # |L| <= 1 with pivoting
+                lu = LUFactorization(A, pivoting=pivoting)
+                B = rng.standard_normal((n, 2))
+                self.assertTrue(np.allclose(A @ lu.solve(B), B))
+                self.assertTrue(np.allclose(A.T @ lu.solve(B, trans=True), B))
+                self.assertAlmostEqual(lu.growth_factor, np.max(np.abs(np.triu(lu.lu))) / np.max(np.abs(A)))
+                cond = np.linalg.cond(A, 1)
+                self.assertTrue(cond / 3 <= lu.condition_estimate() <= cond * (1 + 1e-8))
+        with self.assertRaises(ValueError):
+            LUFactorization(A, pivoting="diagonal")
+        for pivoting in ["none", "partial", "rook", "complete"]:
+            with self.subTest(overwrite=pivoting):
+                B = A.copy()
+                lu = LUFactorization(B, overwrite=True, pivoting=pivoting, block_size=16)
+                self.assertTrue(np.shares_memory(lu.lu, B))
+                self.assertTrue(np.allclose(A @ lu.solve(np.ones(n)), np.ones(n)))
+
+    def test_banded(self):
+        A1 = np.array([[3, 1, 0, 0, 0], [1, 3, 1, 0, 0], [0, 1, 3, 1, 0], [0, 0, 1, 3, 1], [0, 0, 0, 1, 3]], float)
+        b1 = np.array([4, 5, 5, 5, 4], float)
+        self.assertEqual(detect_structure(A1), {"lower": 1, "upper": 1, "symmetric": True,
+                                                "diagonally_dominant": True, "positive_diagonal": True})
+        self.assertTrue(np.allclose(solve(A1, b1), np.ones(5)))
+        self.assertTrue(np.allclose(tridiagonal_solve(np.ones(4), np.full(5, 3.0), np.ones(4), b1), np.ones(5)))
+        rng = np.random.default_rng(3)
+        n = 100
+        A = np.triu(np.tril(rng.standard_normal((n, n)), 3), -2) + 5 * np.eye(n)
+        ab = band_storage(A, 2, 3)
+        self.assertEqual(ab.shape, (6, n))
+        self.assertEqual(ab[3 + 4 - 2, 2], A[4, 2])
+        B = rng.standard_normal((n, 3))
+        self.assertTrue(np.allclose(A @ banded_solve(ab, 2, 3, B), B))
+        S = A + A.T + 20 * np.eye(n)
+        for M in [A, S, scipy.sparse.csr_matrix(A), rng.standard_normal((n, n))]:
+            with self.subTest():
+                self.assertTrue(np.allclose(M @ solve(M, B), B))
+        self.assertTrue(np.allclose(solve(np.diag(np.arange(1.0, 6.0)), b1), b1 / np.arange(1, 6)))
+        # a random sparse matrix has a band as wide as the matrix, it must not end up in band storage
+        W = scipy.sparse.random(400, 400, density=0.005, random_state=4, format="csr") + 10 * scipy.sparse.identity(400)
+        self.assertGreater(detect_structure(W)["lower"] + detect_structure(W)["upper"], 400)
+        w = rng.standard_normal(400)
+        self.assertTrue(np.allclose(W @ solve(W, w), w))
+        self.assertEqual(detect_structure(scipy.sparse.csr_matrix(A))["lower"], 2)
+
 
 
 